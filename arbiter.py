@@ -0,0 +1,144 @@
+import threading
+import time
+
+from debounce import DebouncerBank
+from serial_writer import COMMAND_RELAYS
+
+
+class CommandArbiter:
+    """
+    Menggabungkan keputusan gestur dari banyak sumber (kamera) dan banyak
+    tangan menjadi satu aliran perintah relay. Setiap sumber punya
+    `DebouncerBank` sendiri (satu debouncer per ID tangan). Gestur dipetakan ke
+    kanal relay lewat `relays`. Saat satu tangan meminta perubahan relay,
+    gestur stabil semua tangan yang terlacak (dari semua sumber) untuk relay
+    itu ikut diperiksa; jika ada yang meminta status berbeda, itu konflik dan
+    relay tidak diubah, termasuk jika tangan lain sudah lebih dulu memegang
+    gesturnya. Relay yang konflik diperiksa ulang setiap frame: begitu semua
+    tangan yang tersisa memegang gestur yang sama (tangan lain pergi atau
+    berganti gestur), perintah itulah yang dijalankan.
+    Setelah itu satu relay hanya boleh berganti status jika tidak ada
+    perubahan lain untuk relay yang sama dalam `conflict_window` detik,
+    sehingga dua kamera atau dua tangan yang berbeda tidak membuat relay berkedip.
+
+    Semua perintah hasil satu `submit()` diserahkan sekaligus lewat
+    `send_many` (misalnya `SerialWriter.send_many`) supaya menjadi satu write
+    serial; tanpa itu `send` dipanggil per perintah. `submit()`, `override()`
+    dan `state()` aman dipanggil dari thread berbeda.
+    """
+
+    def __init__(self, send, conflict_window=0.5, relays=None, send_many=None, **debouncer_kwargs):
+        self.send = send                  # Callback perintah, misalnya SerialWriter.send
+        self.send_many = send_many        # Callback opsional untuk semua perintah satu frame
+        self.conflict_window = conflict_window
+        self.relays = relays or COMMAND_RELAYS # gestur -> kanal relay
+        self.debouncer_kwargs = debouncer_kwargs
+        self.banks = {}                   # sumber -> DebouncerBank
+        self.relay_state = {}             # relay -> perintah terakhir yang dikirim
+        self.conflicts = 0                # Jumlah frame dengan permintaan relay yang bertentangan
+        self._relay_changed_at = {}
+        self._pending = {}                # relay -> perintah yang menunggu conflict_window
+        self._conflicted = set()          # Relay yang masih diperebutkan, diperiksa ulang setiap frame
+        self._lock = threading.Lock()
+
+    def submit(self, source, observations, now=None):
+        """
+        Mengirim hasil satu frame dari satu sumber. `observations` adalah
+        dict {id_tangan: gestur}. Mengembalikan daftar perintah yang dikirim.
+        """
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            # Perintah dikirim di dalam lock supaya urutan write sama dengan urutan relay_state
+            sent = self._submit(source, observations, now)
+            self._send_all(sent)
+        return sent
+
+    def _submit(self, source, observations, now):
+        bank = self.banks.get(source)
+        if bank is None:
+            bank = self.banks[source] = DebouncerBank(**self.debouncer_kwargs)
+
+        # Relay yang perlu diputuskan: yang baru diminta di frame ini dan yang masih konflik.
+        # Debouncer tidak mengirim ulang gestur yang sama, jadi keputusan memakai
+        # gestur stabil semua tangan, bukan hanya perintah yang baru dikirim.
+        emitted = bank.update(observations, now)
+        relays = {self.relays.get(command, command) for command in emitted.values()} | self._conflicted
+        self._conflicted = set()
+        for relay in relays:
+            commands = set(self._held_commands(relay).values())
+            if len(commands) > 1:
+                self.conflicts += 1
+                self._conflicted.add(relay)
+                self._pending.pop(relay, None)
+                continue
+            if commands:
+                self._pending[relay] = commands.pop()
+
+        # Perintah yang tertahan conflict_window dicoba lagi pada frame berikutnya;
+        # jika ada perintah lebih baru untuk relay yang sama, yang lama tertimpa.
+        sent = []
+        for relay, command in list(self._pending.items()):
+            if self.relay_state.get(relay) == command:
+                del self._pending[relay]
+                continue
+            if now - self._relay_changed_at.get(relay, float("-inf")) < self.conflict_window:
+                continue
+            del self._pending[relay]
+            self.relay_state[relay] = command
+            self._relay_changed_at[relay] = now
+            sent.append(command)
+        return sent
+
+    def _held_commands(self, relay):
+        """{(sumber, id_tangan): gestur stabil} semua tangan yang gesturnya mengatur `relay`."""
+        held = {}
+        for source, bank in self.banks.items():
+            for hand_id, debouncer in bank.hands.items():
+                command = debouncer.stable
+                if command is not None and self.relays.get(command, command) == relay:
+                    held[(source, hand_id)] = command
+        return held
+
+    def _send_all(self, sent):
+        if not sent:
+            return
+        if self.send_many is not None:
+            self.send_many(sent)
+        else:
+            for command in sent:
+                self.send(command)
+
+    def override(self, command, now=None):
+        """
+        Perintah manual (misalnya dari API) yang melewati debouncing. Status
+        relay dan waktu perubahannya diperbarui seperti perintah gestur, dan
+        perintah gestur yang tertunda untuk relay yang sama dibatalkan.
+        """
+        now = time.perf_counter() if now is None else now
+        relay = self.relays.get(command, command)
+        with self._lock:
+            self.relay_state[relay] = command
+            self._relay_changed_at[relay] = now
+            self._pending.pop(relay, None)
+            self._conflicted.discard(relay)
+            self._send_all([command])
+
+    def state(self):
+        """Salinan status relay saat ini {relay: perintah terakhir}."""
+        with self._lock:
+            return dict(self.relay_state)
+
+    def stable_gesture(self, source, hand_id):
+        """Gestur stabil satu tangan (None jika belum ada), untuk teks status."""
+        bank = self.banks.get(source)
+        debouncer = bank.hands.get(hand_id) if bank else None
+        return debouncer.stable if debouncer else None
+
+    def reset(self):
+        with self._lock:
+            for bank in self.banks.values():
+                bank.reset()
+            self.relay_state.clear()
+            self._relay_changed_at.clear()
+            self._pending.clear()
+            self._conflicted.clear()
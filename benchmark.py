@@ -0,0 +1,269 @@
+"""
+Benchmark pipeline gestur secara offline (tanpa kamera dan tanpa GUI).
+
+Contoh:
+    python benchmark.py rekaman.mp4 --labels rekaman_labels.txt
+    python benchmark.py rekaman.mp4 --dump rekaman.npz
+    python benchmark.py rekaman.npz
+    python benchmark.py rekaman/sesi-0001.hplm
+    python benchmark.py --frame-path --width 1920 --height 1080
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from gestures import classify_gestures
+from landmarks import landmarks_to_array, handedness_to_is_left, mirror_landmarks
+from pipeline import FrameBufferPool, draw_landmarks
+from replay import VideoReplaySource, LandmarkReplaySource, save_landmark_dump, load_labels
+from recording import LandmarkRecording, EXTENSION
+from roi import RoiTracker
+
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1000.0, [50, 95, 99])
+    return {"p50": round(float(p50), 3), "p95": round(float(p95), 3), "p99": round(float(p99), 3)}
+
+
+def peak_memory_mb():
+    """Puncak resident memory proses (MB), None jika tidak didukung OS."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def agreement(predictions, labels):
+    """
+    Persentase frame berlabel yang keputusannya sama dengan ground truth,
+    plus rincian per label.
+    """
+    if labels is None:
+        return None
+    per_label = {}
+    matched = total = 0
+    for predicted, expected in zip(predictions, labels):
+        entry = per_label.setdefault(expected or "-", [0, 0])
+        entry[1] += 1
+        total += 1
+        if predicted == expected:
+            entry[0] += 1
+            matched += 1
+    return {
+        "frames": total,
+        "agreement": round(matched / total, 4) if total else None,
+        "per_label": {k: round(hit / n, 4) for k, (hit, n) in sorted(per_label.items())},
+    }
+
+
+def run_video(path, max_num_hands=1, use_roi=False, dump_path=None):
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(
+        max_num_hands=max_num_hands,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+    roi_tracker = RoiTracker(max_num_hands=max_num_hands, min_detection_confidence=0.7) if use_roi else None
+    source = VideoReplaySource(path)
+    if not source.isOpened():
+        raise SystemExit(f"Gagal membuka video {path}.")
+
+    stages = {"read": [], "convert": [], "detect": [], "classify": [], "total": []}
+    predictions, dumped, dumped_left = [], [], []
+    frame_pool, rgb_pool = FrameBufferPool(), FrameBufferPool()
+
+    while True:
+        t0 = time.perf_counter()
+        success, image = source.read(frame_pool.get(frame_pool.shape) if frame_pool.shape else None)
+        if not success:
+            break
+        frame_pool.get(image.shape)
+        t1 = time.perf_counter()
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_pool.get(image.shape))
+        t2 = time.perf_counter()
+        results = roi_tracker.process(hands, image_rgb) if roi_tracker else hands.process(image_rgb)
+        t3 = time.perf_counter()
+        coords = mirror_landmarks(landmarks_to_array(results.multi_hand_landmarks))
+        is_left = handedness_to_is_left(results.multi_handedness, len(coords), mirrored=False)
+        commands = classify_gestures(coords, is_left)
+        t4 = time.perf_counter()
+
+        stages["read"].append(t1 - t0)
+        stages["convert"].append(t2 - t1)
+        stages["detect"].append(t3 - t2)
+        stages["classify"].append(t4 - t3)
+        stages["total"].append(t4 - t0)
+        predictions.append(commands[0] if commands else "")
+        if dump_path:
+            dumped.append(coords)
+            dumped_left.append(is_left)
+
+    source.release()
+    hands.close()
+    if roi_tracker:
+        roi_tracker.close()
+    if dump_path:
+        save_landmark_dump(dump_path, dumped, is_left=dumped_left)
+    extra = {"roi": roi_tracker.stats()} if roi_tracker else {}
+    return stages, predictions, extra
+
+
+def run_landmarks(path):
+    # Kedua sumber menghasilkan (landmark, is_left) per frame, jadi handedness yang
+    # terekam ikut diklasifikasikan, sama seperti run_video dan reclassify()
+    source = LandmarkRecording(path) if path.endswith(EXTENSION) else LandmarkReplaySource(path)
+    stages = {"classify": [], "total": []}
+    predictions = []
+    for coords, is_left in source:
+        t0 = time.perf_counter()
+        commands = classify_gestures(coords, is_left)
+        t1 = time.perf_counter()
+        stages["classify"].append(t1 - t0)
+        stages["total"].append(t1 - t0)
+        predictions.append(commands[0] if commands else "")
+    return stages, predictions, {"labels": source.labels}
+
+
+def _frame_path_legacy(frame, coords, pools):
+    # Jalur lama: flip dan konversi masing-masing membuat array baru tiap frame
+    image = cv2.flip(frame, 1)
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    draw_landmarks(image, coords)
+    cv2.putText(image, "status", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv2.LINE_AA)
+    return image_rgb
+
+
+def _frame_path_pooled(frame, coords, pools, display=True):
+    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pools["rgb"].get(frame.shape))
+    mirrored = mirror_landmarks(coords.copy())
+    if display:
+        image = cv2.flip(frame, 1, dst=pools["display"].get(frame.shape))
+        draw_landmarks(image, mirrored)
+        cv2.putText(image, "status", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv2.LINE_AA)
+    return image_rgb
+
+
+def run_frame_path(width=1920, height=1080, frames=200):
+    """
+    Membandingkan jalur frame lama (flip + cvtColor yang mengalokasikan array
+    baru) dengan buffer pool (`dst=`) dan mirror di ruang landmark, dengan dan
+    tanpa display. Dilaporkan: waktu per frame dan byte yang dialokasikan
+    sementara per frame (diukur tracemalloc pada putaran terpisah).
+    """
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    coords = rng.random((2, 21, 3)).astype(np.float32)
+    variants = {
+        "lama (flip + cvtColor baru)": lambda pools: _frame_path_legacy(frame, coords, pools),
+        "pool + mirror landmark": lambda pools: _frame_path_pooled(frame, coords, pools),
+        "pool, tanpa display": lambda pools: _frame_path_pooled(frame, coords, pools, display=False),
+    }
+
+    report = {}
+    for name, step in variants.items():
+        pools = {"rgb": FrameBufferPool(), "display": FrameBufferPool()}
+        step(pools) # Pemanasan: alokasi buffer pool terjadi di sini, bukan per frame
+        durations = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            step(pools)
+            durations.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        allocated = []
+        for _ in range(min(frames, 50)):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            step(pools)
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.stop()
+
+        report[name] = {
+            "latency_ms": percentiles(durations),
+            "allocated_mb_per_frame": round(float(np.mean(allocated)) / (1024 * 1024), 3),
+        }
+    return {"resolution": f"{width}x{height}", "frames": frames, "variants": report}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline deteksi gestur.")
+    parser.add_argument("source", nargs="?", help="File video, dump landmark .npz, atau rekaman .hplm")
+    parser.add_argument("--labels", help="File teks label ground truth, satu baris per frame")
+    parser.add_argument("--max-hands", type=int, default=1, help="max_num_hands untuk MediaPipe")
+    parser.add_argument("--roi", action="store_true", help="Aktifkan mode ROI tracking")
+    parser.add_argument("--dump", help="Simpan landmark hasil deteksi video ke file .npz")
+    parser.add_argument("--json", action="store_true", help="Cetak laporan sebagai JSON")
+    parser.add_argument("--frame-path", action="store_true",
+                        help="Benchmark alokasi jalur frame (flip/konversi/gambar) dengan frame sintetis")
+    parser.add_argument("--width", type=int, default=1920, help="Lebar frame untuk --frame-path")
+    parser.add_argument("--height", type=int, default=1080, help="Tinggi frame untuk --frame-path")
+    args = parser.parse_args(argv)
+
+    if args.frame_path:
+        report = run_frame_path(args.width, args.height)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return report
+        print(f"Jalur frame {report['resolution']}, {report['frames']} frame:")
+        for name, result in report["variants"].items():
+            p = result["latency_ms"]
+            print(f"  {name:<28} p50={p['p50']}ms  p95={p['p95']}ms  alokasi={result['allocated_mb_per_frame']} MB/frame")
+        return report
+    if not args.source:
+        parser.error("source wajib diisi kecuali memakai --frame-path")
+
+    start = time.perf_counter()
+    if args.source.endswith((".npz", EXTENSION)):
+        stages, predictions, extra = run_landmarks(args.source)
+        labels = extra.pop("labels")
+    else:
+        stages, predictions, extra = run_video(args.source, args.max_hands, args.roi, args.dump)
+        labels = None
+    elapsed = time.perf_counter() - start
+
+    if args.labels:
+        labels = load_labels(args.labels)
+
+    report = {
+        "source": args.source,
+        "frames": len(predictions),
+        "fps": round(len(predictions) / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {name: percentiles(samples) for name, samples in stages.items()},
+        "peak_memory_mb": peak_memory_mb(),
+        "ground_truth": agreement(predictions, labels),
+        **extra,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return report
+
+    print(f"Sumber     : {report['source']}")
+    print(f"Frame      : {report['frames']}  ({report['fps']} FPS)")
+    print(f"Memori     : {report['peak_memory_mb']} MB (puncak RSS)")
+    print("Latensi per tahap (ms):")
+    for name, p in report["latency_ms"].items():
+        print(f"  {name:<13} p50={p['p50']}  p95={p['p95']}  p99={p['p99']}")
+    if report["ground_truth"]:
+        gt = report["ground_truth"]
+        print(f"Kesesuaian dengan ground truth: {gt['agreement']} dari {gt['frames']} frame")
+        for label, score in gt["per_label"].items():
+            print(f"  {label:<5} {score}")
+    if "roi" in report:
+        print(f"Statistik ROI: {report['roi']}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import glob
+import json
+import os
+import re
+import sys
+import threading
+
+import cv2
+
+# Resolusi yang dicoba saat probing kemampuan kamera
+PROBE_RESOLUTIONS = [(320, 240), (640, 480), (960, 540), (1280, 720), (1920, 1080)]
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "handpose", "cameras.json")
+
+
+def _read_sysfs(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def list_video_devices():
+    """
+    Mendaftar perangkat /dev/video* langsung dari sistem (Linux) tanpa membuka
+    kamera. Node metadata UVC (index sysfs != 0) dilewati karena tidak
+    menghasilkan frame. Mengembalikan list dict berisi indeks, path, nama, dan
+    identitas perangkat.
+    """
+    devices = []
+    for path in sorted(glob.glob("/dev/video*"), key=lambda p: int(re.sub(r"\D", "", p) or 0)):
+        node = os.path.basename(path)
+        match = re.fullmatch(r"video(\d+)", node)
+        if not match:
+            continue
+        sysfs = f"/sys/class/video4linux/{node}"
+        if _read_sysfs(f"{sysfs}/index") not in (None, "0"):
+            continue
+
+        name = _read_sysfs(f"{sysfs}/name") or node
+        device_link = os.path.realpath(f"{sysfs}/device") if os.path.exists(f"{sysfs}/device") else ""
+        devices.append({
+            "index": int(match.group(1)),
+            "path": path,
+            "name": name,
+            # Identitas stabil: nama + lokasi bus USB/PCI, jadi cache tetap valid
+            # selama kamera yang sama tercolok di port yang sama
+            "identity": f"{name}|{device_link or path}",
+        })
+    return devices
+
+
+def probe_camera(index, backend=None):
+    """
+    Membuka kamera sekali dan mencatat nama backend, resolusi yang didukung,
+    serta FPS. Mengembalikan None jika kamera tidak bisa dibuka.
+    """
+    cap = cv2.VideoCapture(index, backend) if backend is not None else cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return None
+        resolutions = []
+        for width, height in PROBE_RESOLUTIONS:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            if actual == (width, height):
+                resolutions.append([width, height])
+        return {
+            "backend": cap.getBackendName(),
+            "resolutions": resolutions,
+            "fps": cap.get(cv2.CAP_PROP_FPS) or None,
+        }
+    finally:
+        cap.release()
+
+
+def _probe_all(indices, timeout, backend=None):
+    """
+    Menjalankan `probe_camera` untuk semua indeks secara paralel. Thread daemon
+    dipakai supaya perangkat yang macet tidak menahan program; hasilnya
+    diabaikan jika melewati `timeout` detik.
+    """
+    results = {}
+
+    def probe(index):
+        try:
+            results[index] = probe_camera(index, backend)
+        except cv2.error:
+            results[index] = None
+
+    threads = [threading.Thread(target=probe, args=(i,), daemon=True) for i in indices]
+    for thread in threads:
+        thread.start()
+    for index, thread in zip(indices, threads):
+        thread.join(timeout)
+        if thread.is_alive():
+            print(f"Probing kamera {index} melebihi {timeout} detik. Melewati...")
+    return results
+
+
+def load_cache(cache_path=DEFAULT_CACHE_PATH):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, cache_path=DEFAULT_CACHE_PATH):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def discover_cameras(cache_path=DEFAULT_CACHE_PATH, timeout=3.0, refresh=False, max_index=10):
+    """
+    Mencari kamera yang tersedia beserta kemampuannya.
+    - Linux: /dev/video* dienumerasi langsung; hanya perangkat yang belum ada
+      di cache (berdasarkan identitas) yang di-probe, secara paralel.
+    - OS lain: indeks 0..max_index-1 di-probe paralel, tanpa cache karena
+      tidak ada identitas perangkat yang stabil.
+    Mengembalikan list dict: index, name, backend, resolutions, fps.
+    """
+    devices = list_video_devices() if sys.platform.startswith("linux") else []
+
+    if not devices:
+        backend = cv2.CAP_DSHOW if sys.platform == "win32" else None
+        probed = _probe_all(list(range(max_index)), timeout, backend)
+        return [
+            {"index": i, "name": f"Camera {i}", **info}
+            for i, info in sorted(probed.items()) if info is not None
+        ]
+
+    cache = {} if refresh else load_cache(cache_path)
+    missing = [d for d in devices if d["identity"] not in cache]
+    if missing:
+        probed = _probe_all([d["index"] for d in missing], timeout, cv2.CAP_V4L2)
+        for device in missing:
+            info = probed.get(device["index"])
+            if info is not None:
+                cache[device["identity"]] = {"name": device["name"], **info}
+        save_cache(cache, cache_path)
+
+    cameras = []
+    for device in devices:
+        info = cache.get(device["identity"])
+        if info is not None:
+            cameras.append({"index": device["index"], "path": device["path"], **info})
+    return cameras
+
+
+def camera_label(camera):
+    """Teks singkat untuk ditampilkan di jendela pratinjau."""
+    return f"Camera {camera['index']}: {camera['name']} (Backend: {camera.get('backend') or 'Generic'})"
@@ -0,0 +1,117 @@
+import time
+
+
+class GestureDebouncer:
+    """
+    State machine debouncing gestur untuk satu tangan. Klasifikasi `window`
+    frame terakhir disimpan di ring buffer bersama hitungan per label yang
+    diperbarui secara inkremental, jadi biaya per frame O(1).
+
+    Sebuah gestur baru menjadi stabil jika:
+    - jumlah suaranya di jendela >= `enter_ratio` * window,
+    - gestur stabil sebelumnya sudah turun di bawah `exit_ratio` * window (histeresis),
+    - gestur tersebut terus unggul selama minimal `min_hold` detik.
+    Perintah dikirim hanya jika berbeda dari perintah terakhir yang dikirim
+    dan cooldown perintah tersebut sudah lewat. Tangan hilang (None) tidak
+    pernah mengirim perintah, jadi gestur yang sama tidak dikirim ulang
+    setelah tangan muncul kembali.
+    """
+
+    def __init__(self, window=7, enter_ratio=0.6, exit_ratio=0.4, min_hold=0.1,
+                 cooldowns=None, default_cooldown=0.3):
+        self.window = window
+        self.enter_votes = max(1, int(round(enter_ratio * window)))
+        self.exit_votes = int(round(exit_ratio * window))
+        self.min_hold = min_hold
+        self.cooldowns = cooldowns or {}
+        self.default_cooldown = default_cooldown
+
+        self._buffer = [None] * window
+        self._pos = 0
+        self._counts = {None: window}
+        self._candidate = None
+        self._candidate_since = None
+        self.stable = None                # Gestur stabil saat ini (None = tidak ada tangan)
+        self.last_emitted = None          # Perintah terakhir yang dikirim
+        self._last_emit_time = float("-inf")
+        self.last_seen = None             # Waktu terakhir tangan terlihat
+
+    def update(self, gesture, now=None):
+        """
+        Memasukkan klasifikasi satu frame (None jika tangan tidak terlihat).
+        Mengembalikan perintah yang harus dikirim, atau None.
+        """
+        now = time.perf_counter() if now is None else now
+        if gesture is not None:
+            self.last_seen = now
+
+        evicted = self._buffer[self._pos]
+        self._buffer[self._pos] = gesture
+        self._pos = (self._pos + 1) % self.window
+        self._counts[evicted] -= 1
+        votes = self._counts.get(gesture, 0) + 1
+        self._counts[gesture] = votes
+
+        if gesture != self.stable and votes >= self.enter_votes \
+                and self._counts.get(self.stable, 0) < self.exit_votes:
+            if self._candidate != gesture:
+                self._candidate = gesture
+                self._candidate_since = now
+            if now - self._candidate_since >= self.min_hold:
+                self.stable = gesture
+                self._candidate = None
+        elif self._candidate is not None and self._counts.get(self._candidate, 0) < self.enter_votes:
+            # Kandidat kehilangan mayoritas sebelum min_hold tercapai
+            self._candidate = None
+
+        return self._maybe_emit(now)
+
+    def _maybe_emit(self, now):
+        command = self.stable
+        if command is None or command == self.last_emitted:
+            return None
+        if now - self._last_emit_time < self.cooldowns.get(command, self.default_cooldown):
+            return None
+        self.last_emitted = command
+        self._last_emit_time = now
+        return command
+
+
+class DebouncerBank:
+    """
+    Kumpulan `GestureDebouncer` per tangan, dikunci dengan ID tangan
+    (misalnya label handedness). Tangan yang tidak terlihat di frame ini
+    menerima suara None; debouncer yang lama tidak terlihat dihapus.
+    """
+
+    def __init__(self, forget_after=5.0, **debouncer_kwargs):
+        self.forget_after = forget_after
+        self.debouncer_kwargs = debouncer_kwargs
+        self.hands = {}
+
+    def update(self, observations, now=None):
+        """
+        `observations` adalah dict {id_tangan: gestur} untuk frame ini.
+        Mengembalikan dict {id_tangan: perintah} untuk perintah yang harus dikirim.
+        """
+        now = time.perf_counter() if now is None else now
+        emitted = {}
+        for hand_id, gesture in observations.items():
+            debouncer = self.hands.get(hand_id)
+            if debouncer is None:
+                debouncer = self.hands[hand_id] = GestureDebouncer(**self.debouncer_kwargs)
+            command = debouncer.update(gesture, now)
+            if command is not None:
+                emitted[hand_id] = command
+
+        for hand_id in list(self.hands):
+            if hand_id in observations:
+                continue
+            debouncer = self.hands[hand_id]
+            debouncer.update(None, now)
+            if debouncer.last_seen is None or now - debouncer.last_seen > self.forget_after:
+                del self.hands[hand_id]
+        return emitted
+
+    def reset(self):
+        self.hands.clear()
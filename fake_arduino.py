@@ -0,0 +1,304 @@
+"""
+Arduino virtual di atas pseudo-terminal (pty) untuk menguji sisi serial tanpa
+perangkat keras. Perangkat ini menerima protokol relay yang sama dengan
+sketch Arduino (satu perintah per baris: ON/OFF untuk lampu, O/C untuk
+pintu), membalas satu baris ACK per perintah, dan bisa mensimulasikan
+kecepatan baud, byte yang hilang, serta koneksi yang terputus. Protokol
+frame biner dari serial_protocol.py juga dilayani (bisa dimatikan dengan
+--text-only untuk meniru sketch lama).
+
+Contoh:
+    python fake_arduino.py                      # cetak path port, lalu layani perintah
+    python fake_arduino.py --drop 0.01 --disconnect-every 20
+    python fake_arduino.py --load-test --rate 30 --duration 10
+    python fake_arduino.py --load-test --protocol binary
+"""
+import argparse
+import os
+import pty
+import random
+import select
+import tempfile
+import threading
+import time
+import tty
+
+import numpy as np
+
+from serial_protocol import (
+    BAUD_RATES, OP_HELLO, OP_SET_RELAYS, STATUS_OK, STATUS_BAD_CHECKSUM, STATUS_UNKNOWN,
+    FrameDecoder, decode_relays, encode_ack,
+)
+from serial_writer import COMMAND_RELAYS
+
+
+class FakeArduino(threading.Thread):
+    """
+    Perangkat palsu di sisi master pty. Port yang dibuka aplikasi (`port`)
+    adalah symlink ke sisi slave; saat koneksi diputus, pty lama ditutup dan
+    symlink diarahkan ke pty baru setelah `down_time`, sehingga SerialWriter
+    bisa menyambung ulang ke path yang sama seperti ke Arduino yang dicolok ulang.
+
+    - `baudrate`: setiap byte (8N1 = 10 bit) butuh 10/baudrate detik, baik
+      saat diterima maupun saat ACK dikirim
+    - `drop_rate`: peluang setiap byte yang diterima hilang
+    - `disconnect_every`: putus otomatis setiap N detik (None = tidak pernah)
+    - `binary`: layani protokol frame biner dan negosiasi baud rate
+    """
+
+    def __init__(self, baudrate=9600, drop_rate=0.0, disconnect_every=None, down_time=1.0,
+                 ack=True, relays=None, seed=None, verbose=False, binary=True):
+        super().__init__(name="fake-arduino", daemon=True)
+        self.initial_baudrate = baudrate
+        self.baudrate = baudrate
+        self.binary = binary
+        self.drop_rate = drop_rate
+        self.disconnect_every = disconnect_every
+        self.down_time = down_time
+        self.ack = ack
+        self.relays = relays or COMMAND_RELAYS
+        self.verbose = verbose
+        self.relay_state = {}              # relay -> perintah terakhir yang dijalankan
+        self.commands = []                 # (waktu, perintah) yang berhasil dijalankan
+        self.errors = 0                    # Baris yang tidak dikenali (misalnya karena byte hilang)
+        self.bytes_dropped = 0
+        self.disconnects = 0
+        self.latencies = []                # Byte pertama perintah diterima -> ACK selesai dikirim (detik)
+        self._random = random.Random(seed)
+        self._stop_event = threading.Event()
+        self._master = None
+        self._slave = None
+
+        self._dir = tempfile.mkdtemp(prefix="fake-arduino-")
+        self.port = os.path.join(self._dir, "ttyFAKE0")
+        self._open_pty()
+
+    def _open_pty(self):
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        link = self.port + ".tmp"
+        os.symlink(os.ttyname(self._slave), link)
+        os.replace(link, self.port)
+
+    def _close_pty(self):
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._master = self._slave = None
+        try:
+            os.remove(self.port)
+        except FileNotFoundError:
+            pass
+
+    def _byte_time(self, count):
+        return count * 10.0 / self.baudrate
+
+    def disconnect(self):
+        """Memutus koneksi seperti kabel USB dicabut, lalu tersedia lagi setelah `down_time`."""
+        self.disconnects += 1
+        self._close_pty()
+        if self.verbose:
+            print(f"[fake-arduino] terputus, kembali dalam {self.down_time} detik")
+        self._stop_event.wait(self.down_time)
+        if not self._stop_event.is_set():
+            self._open_pty()
+            # Arduino asli reset saat port dibuka ulang, jadi semua relay dan baud kembali ke awal
+            self.relay_state.clear()
+            self.baudrate = self.initial_baudrate
+
+    def run(self):
+        decoder = FrameDecoder()
+        line_started = None
+        next_disconnect = time.perf_counter() + self.disconnect_every if self.disconnect_every else None
+        try:
+            while not self._stop_event.is_set():
+                if next_disconnect and time.perf_counter() >= next_disconnect:
+                    decoder, line_started = FrameDecoder(), None
+                    self.disconnect()
+                    next_disconnect = time.perf_counter() + self.disconnect_every
+                    continue
+
+                ready, _, _ = select.select([self._master], [], [], 0.05)
+                if not ready:
+                    continue
+                try:
+                    data = os.read(self._master, 256)
+                except OSError:
+                    continue
+                received_at = time.perf_counter()
+                time.sleep(self._byte_time(len(data)))
+
+                if self.drop_rate:
+                    kept = bytes(b for b in data if self._random.random() >= self.drop_rate)
+                    self.bytes_dropped += len(data) - len(kept)
+                    data = kept
+                if data and line_started is None:
+                    line_started = received_at
+
+                items = decoder.feed(data)
+                for item in items:
+                    if item[0] == "text":
+                        self._handle(item[1], line_started)
+                    else:
+                        self._handle_frame(item, line_started)
+                if items:
+                    line_started = received_at if decoder.buffer else None
+        finally:
+            self._close_pty()
+
+    def _handle(self, command, started):
+        relay = self.relays.get(command)
+        if relay is None:
+            self.errors += 1
+            reply = f"ERR {command}"
+        else:
+            self.relay_state[relay] = command
+            self.commands.append((time.perf_counter(), command))
+            reply = f"OK {command}"
+        if self.verbose:
+            print(f"[fake-arduino] {command!r} -> {reply}")
+        if self.ack:
+            self._reply(f"{reply}\n".encode("utf-8"), started)
+
+    def _handle_frame(self, item, started):
+        kind, opcode, seq = item[:3]
+        if not self.binary:
+            # Sketch lama tidak mengenal frame biner: byte-nya hanya menjadi baris rusak
+            self.errors += 1
+            return
+        new_baudrate = None
+        if kind == "bad_frame":
+            self.errors += 1
+            status = STATUS_BAD_CHECKSUM
+        elif opcode == OP_SET_RELAYS:
+            for command in decode_relays(*item[3]):
+                self.relay_state[self.relays.get(command, command)] = command
+                self.commands.append((time.perf_counter(), command))
+            status = STATUS_OK
+        elif opcode == OP_HELLO and item[3][0] < len(BAUD_RATES):
+            new_baudrate = BAUD_RATES[item[3][0]]
+            status = STATUS_OK
+        else:
+            status = STATUS_UNKNOWN
+        if self.verbose:
+            print(f"[fake-arduino] frame op={opcode:#04x} seq={seq} -> status {status}")
+        self._reply(encode_ack(opcode, seq, status), started)
+        if new_baudrate:
+            # Pindah baud setelah ACK terkirim, sama seperti pengirim
+            self.baudrate = new_baudrate
+
+    def _reply(self, payload, started):
+        time.sleep(self._byte_time(len(payload)))
+        try:
+            os.write(self._master, payload)
+        except OSError:
+            return
+        if started is not None:
+            self.latencies.append(time.perf_counter() - started)
+
+    def stats(self):
+        latencies = np.asarray(self.latencies) * 1000.0
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (None,) * 3
+        return {
+            "commands": len(self.commands),
+            "errors": self.errors,
+            "bytes_dropped": self.bytes_dropped,
+            "disconnects": self.disconnects,
+            "baudrate": self.baudrate,
+            "relay_state": dict(self.relay_state),
+            "latency_ms": {k: None if v is None else round(float(v), 3)
+                           for k, v in (("p50", p50), ("p95", p95), ("p99", p99))},
+        }
+
+    def close(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=2)
+        else:
+            self._close_pty()
+        try:
+            os.rmdir(self._dir)
+        except OSError:
+            pass
+
+
+def load_test(rate=30.0, duration=10.0, protocol="text", **fake_kwargs):
+    """
+    Menjalankan SerialWriter (dengan ACK) melawan FakeArduino: perintah
+    bergantian dikirim `rate` kali per detik selama `duration` detik.
+    """
+    from metrics import Metrics
+    from serial_writer import SerialWriter
+
+    device = FakeArduino(**fake_kwargs)
+    device.start()
+    metrics = Metrics()
+    writer = SerialWriter(device.port, device.baudrate, reset_delay=0.0, ack=True, metrics=metrics, protocol=protocol)
+    writer.start()
+    writer.wait_first_attempt(timeout=2)
+
+    cycle = ["ON", "O", "OFF", "C"]
+    sent = 0
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < duration:
+            writer.send(cycle[sent % len(cycle)])
+            sent += 1
+            time.sleep(1.0 / rate)
+        time.sleep(0.5) # Beri waktu perintah terakhir sampai
+    finally:
+        writer.close()
+        device.close()
+
+    snapshot = metrics.snapshot()
+    return {
+        "sent": sent,
+        "device": device.stats(),
+        "serial_write": snapshot["stages"].get("serial_write"),
+        "serial_ack": snapshot["stages"].get("serial_ack"),
+        "counters": snapshot["counters"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arduino virtual berbasis pty untuk menguji sisi serial.")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--drop", type=float, default=0.0, help="Peluang tiap byte hilang (0..1)")
+    parser.add_argument("--disconnect-every", type=float, help="Putus otomatis setiap N detik")
+    parser.add_argument("--down-time", type=float, default=1.0, help="Lama port hilang saat terputus")
+    parser.add_argument("--no-ack", action="store_true", help="Jangan membalas perintah teks")
+    parser.add_argument("--text-only", action="store_true", help="Tiru sketch lama tanpa protokol biner")
+    parser.add_argument("--protocol", choices=["text", "binary"], default="text", help="Protokol SerialWriter untuk --load-test")
+    parser.add_argument("--load-test", action="store_true", help="Jalankan SerialWriter melawan perangkat ini")
+    parser.add_argument("--rate", type=float, default=30.0, help="Perintah per detik untuk --load-test")
+    parser.add_argument("--duration", type=float, default=10.0, help="Lama --load-test (detik)")
+    args = parser.parse_args(argv)
+
+    fake_kwargs = dict(baudrate=args.baud, drop_rate=args.drop, disconnect_every=args.disconnect_every,
+                       down_time=args.down_time, ack=not args.no_ack, binary=not args.text_only)
+    if args.load_test:
+        report = load_test(args.rate, args.duration, args.protocol, **fake_kwargs)
+        print(f"Perintah dikirim: {report['sent']}")
+        print(f"Perangkat: {report['device']}")
+        print(f"serial_write: {report['serial_write']}")
+        print(f"serial_ack: {report['serial_ack']}")
+        print(f"Penghitung: {report['counters']}")
+        return report
+
+    device = FakeArduino(verbose=True, **fake_kwargs)
+    device.start()
+    print(f"Arduino virtual siap di {device.port}. Tekan Ctrl+C untuk berhenti.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        device.close()
+        print(f"Statistik: {device.stats()}")
+
+
+if __name__ == "__main__":
+    main()
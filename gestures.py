@@ -0,0 +1,180 @@
+import json
+import os
+
+import numpy as np
+
+from landmarks import (
+    FINGER_NAMES, landmarks_to_array, handedness_to_is_left, finger_open_states,
+    finger_masks, fingertip_distances, joint_angles, palm_size,
+)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+
+# Definisi bawaan, sama dengan aturan lama di get_gesture_command.
+# Urutan = prioritas: gestur paling spesifik dulu (V dan 3 jari), lalu gestur umum.
+DEFAULT_GESTURES = {
+    "thumb_margin": 0.0,
+    "gestures": [
+        {"name": "ON", "fingers": {"index": True, "middle": True, "ring": False, "pinky": False}},
+        {"name": "OFF", "fingers": {"index": True, "middle": True, "ring": True, "pinky": False}},
+        {"name": "O", "min_open": 4},
+        {"name": "C", "default": True},
+    ],
+}
+
+
+def _predicate_tip_distance(spec):
+    """Jarak dua ujung jari, dinormalkan dengan ukuran telapak."""
+    a, b = (FINGER_NAMES.index(f) for f in spec["fingers"])
+    low, high = spec.get("min", -np.inf), spec.get("max", np.inf)
+
+    def evaluate(coords):
+        distance = fingertip_distances(coords)[:, a, b] / np.maximum(palm_size(coords), 1e-6)
+        return (distance >= low) & (distance <= high)
+    return evaluate
+
+
+def _predicate_joint_angle(spec):
+    """Sudut satu sendi jari (radian, pi = lurus)."""
+    finger = FINGER_NAMES.index(spec["finger"])
+    joint = spec.get("joint", 1)
+    low, high = spec.get("min", -np.inf), spec.get("max", np.inf)
+
+    def evaluate(coords):
+        angle = joint_angles(coords)[:, finger, joint]
+        return (angle >= low) & (angle <= high)
+    return evaluate
+
+
+PREDICATES = {
+    "tip_distance": _predicate_tip_distance,
+    "joint_angle": _predicate_joint_angle,
+}
+
+
+class GestureRegistry:
+    """
+    Registry gestur yang dikompilasi sekali menjadi tabel lookup 32 entri,
+    diindeks dengan mask 5-bit status jari. Gestur tanpa predikat langsung
+    diselesaikan oleh tabel; gestur dengan predikat geometris dievaluasi
+    secara vektor hanya untuk tangan yang mask-nya cocok. Menambah gestur
+    tidak menambah percabangan per frame.
+
+    Di tingkat config, "thumb_margin" adalah jarak minimal jempol ke arah luar
+    telapak; "thumb_threshold_x" (opsional) menggantinya dengan aturan lama:
+    jempol terbuka jika cukup jauh dari sendinya ke arah mana pun.
+
+    Setiap gestur di config:
+    - "name": perintah yang dihasilkan
+    - "fingers": {nama_jari: true/false}, jari yang tidak disebut bebas
+    - "min_open" / "max_open": batas jumlah jari terbuka
+    - "predicates": [{"type": "tip_distance" | "joint_angle", ...}]
+    - "default": true untuk gestur cadangan jika tidak ada yang cocok
+    - "enabled": false untuk menonaktifkan tanpa menghapus definisi
+    """
+
+    def __init__(self, config=None):
+        config = config or DEFAULT_GESTURES
+        self.thumb_margin = config.get("thumb_margin", 0.0)
+        self.thumb_threshold_x = config.get("thumb_threshold_x")
+        gestures = [g for g in config["gestures"] if g.get("enabled", True)]
+
+        self.names = [g["name"] for g in gestures]
+        self.names.append(None) # Indeks terakhir: tidak ada gestur yang cocok
+        fallback = next((i for i, g in enumerate(gestures) if g.get("default")), len(gestures))
+
+        self.table = np.full(32, fallback, dtype=np.int16)
+        self.predicate_rules = []
+        mask_ids = np.arange(32)
+        open_counts = np.array([bin(m).count("1") for m in range(32)])
+
+        for index in reversed(range(len(gestures))):
+            gesture = gestures[index]
+            if gesture.get("default"):
+                continue
+            allowed = np.ones(32, dtype=bool)
+            for finger, is_open in gesture.get("fingers", {}).items():
+                bit = 1 << FINGER_NAMES.index(finger)
+                allowed &= ((mask_ids & bit) != 0) == bool(is_open)
+            allowed &= open_counts >= gesture.get("min_open", 0)
+            allowed &= open_counts <= gesture.get("max_open", 5)
+
+            predicates = [PREDICATES[p["type"]](p) for p in gesture.get("predicates", [])]
+            if predicates:
+                self.predicate_rules.append((index, allowed, predicates))
+            else:
+                # Iterasi dari prioritas terendah, jadi gestur berprioritas lebih tinggi menimpa
+                self.table[allowed] = index
+
+        # Aturan berpredikat dievaluasi dari prioritas terendah ke tertinggi
+        self.predicate_rules.sort(key=lambda rule: -rule[0])
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_CONFIG_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def classify(self, coords, is_left=None):
+        """
+        Mengklasifikasikan semua tangan sekaligus. `is_left` (tangan,) bool
+        dipakai untuk arah jempol; tanpa itu semua tangan dianggap kanan.
+        """
+        if len(coords) == 0:
+            return []
+        states = finger_open_states(coords, thumb_threshold_x=self.thumb_threshold_x, is_left=is_left,
+                                    thumb_margin=self.thumb_margin)
+        masks = finger_masks(states)
+        result = self.table[masks]
+
+        for index, allowed, predicates in self.predicate_rules:
+            candidates = allowed[masks] & (result > index)
+            if not candidates.any():
+                continue
+            passed = candidates.copy()
+            for evaluate in predicates:
+                passed &= evaluate(coords)
+            result[passed] = index
+
+        return [self.names[i] for i in result]
+
+
+def load_registry(path=DEFAULT_CONFIG_PATH, default=None):
+    """Memuat registry dari file config; jika tidak ada, memakai `default` atau definisi bawaan."""
+    if path and os.path.exists(path):
+        return GestureRegistry.from_file(path)
+    return GestureRegistry(default)
+
+
+registry = load_registry()
+active_classifier = registry
+
+
+def use_classifier(classifier=None):
+    """
+    Mengganti classifier yang dipakai `classify_gestures`, misalnya model dari
+    `learned_classifier.py`. Tanpa argumen kembali ke registry aturan.
+    """
+    global active_classifier
+    active_classifier = classifier or registry
+
+
+def classify_gestures(coords, is_left=None):
+    """
+    Mengklasifikasikan gestur semua tangan sekaligus dari array (tangan, 21, 3)
+    memakai classifier aktif, bawaannya registry dari `gestures.json`. Dengan config bawaan:
+    - V sign (2 jari) -> "ON"
+    - 3 Jari -> "OFF"
+    - Tangan Terbuka -> "O"
+    - Tangan Tertutup -> "C"
+    Mengembalikan list perintah, satu per tangan.
+    """
+    return active_classifier.classify(coords, is_left)
+
+
+def get_gesture_command(hand_landmarks, handedness=None):
+    """
+    Mendeteksi gestur satu tangan dan mengembalikan perintah yang sesuai.
+    Pembungkus `classify_gestures` untuk kode lama yang bekerja per tangan.
+    """
+    is_left = handedness_to_is_left([handedness], 1) if handedness is not None else None
+    return classify_gestures(landmarks_to_array([hand_landmarks]), is_left)[0]
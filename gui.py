@@ -1,133 +1,417 @@
-import cv2
-import mediapipe as mp
-import serial
 import time
+_startup_origin = time.perf_counter() # Titik nol laporan waktu startup
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 import serial.tools.list_ports # Pustaka untuk mendeteksi port serial
+from serial_writer import SerialWriter
+from scheduler import AdaptiveScheduler
+from arbiter import CommandArbiter
+from metrics import Metrics, NullMetrics, MetricsServer, MetricsFileExporter
+from startup import StartupTimer, BackgroundLoader
+
+# Modul berat (cv2, mediapipe, numpy) dan model Hands tidak dimuat saat import,
+# melainkan di thread latar belakang selagi pengguna memilih port.
+# Lihat load_detection_modules().
+startup_timer = StartupTimer(origin=_startup_origin)
+startup_timer.mark("modul ringan dimuat")
+STARTUP_REPORT_FILE = None # Misal "startup.json" untuk menyimpan laporan waktu startup
 
 # --- Global Variables ---
-arduino = None # Akan diisi setelah port dipilih
+arduino = None # SerialWriter, akan diisi setelah port dipilih
 cap = None     # Objek kamera, akan diinisialisasi setelah port dikonfirmasi
 is_running = False # Flag untuk mengontrol loop video
 
-# --- MediaPipe & Servo Configuration (unchanged from previous version) ---
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
+# Sumber video: indeks kamera (int) atau path file rekaman untuk replay tanpa kamera
+CAMERA_SOURCE = 0
+
+# --- MediaPipe & Servo Configuration ---
+# Diisi oleh load_detection_modules() di thread latar belakang
+cv2 = None
+mp_hands = None
+hands = None
+roi_tracker = None
+rgb_pool = scaled_pool = None # Buffer konversi frame, dibuat saat deteksi dimulai
+last_status_text = "Arahkan tangan ke kamera" # Ditampilkan ulang pada frame yang dilewati scheduler
+
+# --- Debouncing Gestur ---
+# Gestur harus menang mayoritas di DEBOUNCE_WINDOW frame terakhir dan bertahan
+# minimal DEBOUNCE_MIN_HOLD detik sebelum perintahnya dikirim. Cooldown per
+# perintah mencegah relay berganti-ganti terlalu cepat.
+DEBOUNCE_WINDOW = 7
+DEBOUNCE_MIN_HOLD = 0.1
+COMMAND_COOLDOWNS = {"ON": 0.5, "OFF": 0.5, 'O': 1.0, 'C': 1.0}
+
+# --- Multi-Tangan & Relay ---
+# Setiap tangan mendapat ID tetap dari HandTracker dan debouncer sendiri.
+# RELAY_CHANNELS memetakan gestur ke kanal relay; arbiter menggabungkan niat
+# semua tangan (konflik pada relay yang sama diabaikan) menjadi satu write
+# serial per frame. MAX_NUM_HANDS = 2 bersifat opsional: selama tangan kedua
+# belum terlihat, MediaPipe menjalankan deteksi telapak di setiap frame untuk
+# mencarinya, sehingga penghematan mode tracking hilang.
+MAX_NUM_HANDS = 1
+RELAY_CHANNELS = {"ON": "lamp", "OFF": "lamp", 'O': "pintu", 'C': "pintu"}
+arbiter = CommandArbiter(
+    send=lambda command: arduino.send(command),
+    send_many=lambda commands: arduino.send_many(commands),
+    relays=RELAY_CHANNELS,
+    window=DEBOUNCE_WINDOW,
+    min_hold=DEBOUNCE_MIN_HOLD,
+    cooldowns=COMMAND_COOLDOWNS
 )
-mp_draw = mp.solutions.drawing_utils
-prev_hand_state = None # 'open' atau 'closed'
+hand_tracker = None # Dibuat oleh load_detection_modules() (butuh numpy)
+
+# --- ROI Tracking ---
+# Jika aktif, deteksi frame penuh hanya dijalankan tiap beberapa frame;
+# di antaranya hanya potongan di sekitar tangan yang diproses. Nonaktif secara
+# bawaan: potongan diproses Hands mode gambar statis yang menjalankan deteksi
+# telapak setiap kali, sedangkan Hands mode video biasa sudah memotong di sekitar
+# landmark terakhir sendiri. Aktifkan hanya jika `benchmark.py --roi` pada
+# video asli menunjukkan p50 detect lebih rendah di perangkat target.
+USE_ROI_TRACKING = False
+
+# --- Adaptive Scheduler ---
+# Menyesuaikan resolusi kamera, skala inferensi, dan rasio lompat frame
+# supaya latensi end-to-end tetap di bawah TARGET_LATENCY (detik).
+USE_ADAPTIVE_SCHEDULER = True
+TARGET_LATENCY = 0.066
+scheduler = None # Dibuat ulang setiap kali deteksi dimulai
+
+# --- Instrumentasi ---
+# Histogram waktu per tahap. Jika METRICS_ENABLED False, semua pencatatan menjadi no-op.
+METRICS_ENABLED = True
+METRICS_PORT = 9108  # Endpoint lokal http://127.0.0.1:9108/metrics, None untuk mematikan
+METRICS_FILE = None  # Misal "metrics.json" atau "metrics.prom" untuk ekspor berkala ke file
+metrics = Metrics() if METRICS_ENABLED else NullMetrics()
+
+# --- Serial ---
+# Jika True, SerialWriter menunggu satu baris balasan dari Arduino per perintah
+# untuk mengukur latensi perintah-ke-ACK (butuh sketch yang membalas).
+SERIAL_ACK = False
+# "binary" memakai protokol frame biner (serial_protocol.py) dengan baud rate
+# SERIAL_BINARY_BAUDRATE jika sketch mendukungnya; jika tidak, kembali ke teks.
+SERIAL_PROTOCOL = "text"
+SERIAL_BINARY_BAUDRATE = 115200
+
+# --- Gerbang Gerakan ---
+# Saat tidak ada gerakan dan tidak ada tangan selama MOTION_IDLE_AFTER detik,
+# inferensi hanya dijalankan sekali per MOTION_IDLE_INTERVAL detik. Gerakan
+# pertama langsung mengembalikan laju penuh pada frame yang sama.
+USE_MOTION_GATE = True
+MOTION_IDLE_AFTER = 3.0
+MOTION_IDLE_INTERVAL = 1.0
+motion_gate = None # Dibuat oleh load_detection_modules() (butuh cv2)
+
+# --- Smoothing Landmark ---
+# Filter One-Euro atas landmark sebelum klasifikasi. Jitter diredam di sini,
+# jadi ambang kepercayaan MediaPipe bisa lebih rendah dan tangan lebih jarang
+# hilang (deteksi ulang penuh lebih jarang). Tangan yang hilang sebentar
+# (<= SMOOTHING_MAX_GAP detik) diprediksi dari kecepatan terakhir.
+USE_LANDMARK_SMOOTHING = True
+SMOOTHING_MAX_GAP = 0.2
+DETECTION_CONFIDENCE = 0.5 if USE_LANDMARK_SMOOTHING else 0.7
+TRACKING_CONFIDENCE = 0.5 if USE_LANDMARK_SMOOTHING else 0.7
+landmark_smoother = None # Dibuat oleh load_detection_modules() (butuh numpy)
+
+# --- Rekaman Landmark ---
+# Prefix file rekaman biner (misal "rekaman/sesi" -> rekaman/sesi-0001.hplm).
+# Ditulis di thread latar belakang; baca ulang dengan recording.py. None = mati.
+RECORD_LANDMARKS = None
+recorder = None
+
+# --- Classifier Gestur ---
+# Path model hasil `learned_classifier.py train` (misal "gesture_model.npz").
+# None berarti memakai aturan di gestures.json.
+GESTURE_MODEL = None
+
+def load_detection_modules():
+    """
+    Memuat modul berat dan membuat model MediaPipe Hands, lalu menjalankan satu
+    inferensi kosong supaya graph sudah siap saat frame pertama datang.
+    Dijalankan oleh BackgroundLoader selagi jendela pemilihan port tampil.
+    """
+    global cv2, mp_hands, hands, roi_tracker, landmark_smoother, hand_tracker, motion_gate
+    global LatestQueue, CaptureWorker, StageWorker, FrameBufferPool, FramePacket, draw_landmarks
+    global landmarks_to_array, handedness_to_is_left, mirror_landmarks
+    global classify_gestures, VideoReplaySource
+
+    import cv2
+    import numpy as np
+    import mediapipe as mp
+    startup_timer.mark("cv2/mediapipe diimpor")
+    from pipeline import LatestQueue, CaptureWorker, StageWorker, FrameBufferPool, FramePacket, draw_landmarks
+    from landmarks import landmarks_to_array, handedness_to_is_left, mirror_landmarks
+    from tracking import HandTracker
+    from gestures import classify_gestures, use_classifier
+    from roi import RoiTracker
+    from replay import VideoReplaySource
+
+    mp_hands = mp.solutions.hands
+    hands = mp_hands.Hands(
+        max_num_hands=MAX_NUM_HANDS,
+        min_detection_confidence=DETECTION_CONFIDENCE,
+        min_tracking_confidence=TRACKING_CONFIDENCE
+    )
+    roi_tracker = RoiTracker(keyframe_interval=15, margin=0.3, roi_size=256, max_num_hands=MAX_NUM_HANDS,
+                             min_detection_confidence=DETECTION_CONFIDENCE)
+    hand_tracker = HandTracker()
+    if USE_MOTION_GATE:
+        from motion import MotionGate
+        motion_gate = MotionGate(idle_after=MOTION_IDLE_AFTER, idle_interval=MOTION_IDLE_INTERVAL)
+    if USE_LANDMARK_SMOOTHING:
+        from smoothing import LandmarkSmoother
+        landmark_smoother = LandmarkSmoother(max_gap=SMOOTHING_MAX_GAP)
+    startup_timer.mark("model Hands dibuat")
+    if GESTURE_MODEL:
+        from learned_classifier import LearnedGestureClassifier
+        use_classifier(LearnedGestureClassifier.load(GESTURE_MODEL))
+        print(f"Memakai model gestur {GESTURE_MODEL}.")
+
+    hands.process(np.zeros((240, 320, 3), dtype=np.uint8))
+
+model_loader = BackgroundLoader(load_detection_modules, timer=startup_timer)
 
-def get_gesture_command(hand_landmarks):
+# --- Main Application Logic (runs after port is selected) ---
+STATUS_TEXTS = {
+    "ON": "on lamp",
+    "OFF": "off lamp",
+    'O': "open pintu",
+    'C': "close",
+}
+
+def process_frame(packet):
     """
-    Mendeteksi gestur tangan dan mengembalikan perintah yang sesuai.
-    - V sign (2 jari) -> "ON"
-    - 3 Jari -> "OFF"
-    - Tangan Terbuka -> "O"
-    - Tangan Tertutup -> "C"
+    Tahap inferensi: gerbang gerakan, konversi warna, deteksi tangan, mirror
+    landmark, lalu klasifikasi. Frame tidak di-flip; konversi dan resize
+    menulis ke buffer pool yang sudah dialokasikan (`dst=`). Perintah baru
+    langsung diserahkan ke SerialWriter (tanpa menunggu I/O) supaya latensi
+    gestur-ke-relay hanya bergantung pada waktu inferensi.
     """
-    # Helper untuk memeriksa apakah jari terbuka
-    def is_finger_open(tip_index, pip_index):
-        return hand_landmarks.landmark[tip_index].y < hand_landmarks.landmark[pip_index].y
-
-    # Status jari individu
-    index_open = is_finger_open(8, 7)
-    middle_open = is_finger_open(12, 11)
-    ring_open = is_finger_open(16, 15)
-    pinky_open = is_finger_open(20, 19)
-    thumb_open = hand_landmarks.landmark[4].x < hand_landmarks.landmark[3].x # Asumsi tangan kanan
-
-    # 1. Cek gestur paling spesifik dulu (V dan 3 jari)
-    # Gestur "V" (ON untuk Pin 8)
-    if index_open and middle_open and not ring_open and not pinky_open:
-        return "ON"
-    # Gestur "Tiga Jari" (OFF untuk Pin 8)
-    if index_open and middle_open and ring_open and not pinky_open:
-        return "OFF"
-
-    # 2. Cek gestur umum (terbuka/tertutup) jika gestur spesifik tidak ditemukan
-    fingers_open_count = sum([index_open, middle_open, ring_open, pinky_open, thumb_open])
-    
-    # Gestur Tangan Terbuka (O untuk Pin 7)
-    if fingers_open_count >= 4:
-        return 'O'
-    # Gestur Tangan Tertutup (C untuk Pin 7)
+    global last_status_text
+    if motion_gate:
+        with metrics.timer("motion_gate"):
+            active = motion_gate.update(packet.image, packet.captured_at)
+        metrics.set_gauge("duty_cycle", round(motion_gate.duty_cycle, 4))
+        metrics.set_gauge("idle", int(motion_gate.idle))
+        if not active:
+            # Frame tetap ditampilkan, hanya inferensi yang dilewati
+            metrics.increment("frames_gated")
+            packet.status_text = "Idle: tidak ada gerakan"
+            return packet
+
+    if scheduler and not scheduler.should_process():
+        # Sama seperti gerbang gerakan: frame tetap ditampilkan, hanya inferensi
+        # yang dilewati. Teks status terakhir dipertahankan supaya tidak berkedip.
+        metrics.increment("frames_skipped")
+        packet.status_text = last_status_text
+        return packet
+
+    start = time.perf_counter()
+    with metrics.timer("convert"):
+        image = packet.image
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_pool.get(image.shape))
+        if scheduler and scheduler.scale < 1.0:
+            # Landmark MediaPipe ternormalisasi, jadi hasilnya tetap cocok dengan frame asli
+            height, width = image.shape[:2]
+            size = (int(width * scheduler.scale), int(height * scheduler.scale))
+            image_rgb = cv2.resize(image_rgb, size, dst=scaled_pool.get((size[1], size[0], 3)), interpolation=cv2.INTER_AREA)
+    with metrics.timer("inference"):
+        if USE_ROI_TRACKING:
+            results = roi_tracker.process(hands, image_rgb)
+        else:
+            results = hands.process(image_rgb)
+
+    packet.results = results
+    packet.status_text = "Arahkan tangan ke kamera"
+
+    # Semua tangan diubah ke satu array (tangan, 21, 3) lalu diklasifikasikan sekaligus
+    coords = mirror_landmarks(landmarks_to_array(results.multi_hand_landmarks))
+    is_left = handedness_to_is_left(results.multi_handedness, len(coords), mirrored=False)
+    hand_ids = hand_tracker.update(coords, is_left, packet.captured_at)
+    if motion_gate:
+        motion_gate.report_hands(len(coords), packet.captured_at)
+    if recorder:
+        recorder.record(packet.captured_at, coords, is_left)
+    if landmark_smoother:
+        with metrics.timer("smoothing"):
+            hand_ids, coords, is_left, _ = landmark_smoother.update(hand_ids, coords, is_left, packet.captured_at)
+    packet.landmarks = coords
+
+    if hand_ids:
+        with metrics.timer("classify"):
+            commands = classify_gestures(coords, is_left)
+        observations = dict(zip(hand_ids, commands))
     else:
-        return 'C'
+        observations = {}
+        packet.status_text = "Tidak ada tangan terdeteksi"
+
+    sent = arbiter.submit("camera", observations, packet.captured_at)
+    if sent:
+        packet.command = sent[-1]
+        print(f"Mengirim: {', '.join(repr(c) for c in sent)} -> {', '.join(STATUS_TEXTS.get(c, c) for c in sent)}")
+    stable = [(hand_id, arbiter.stable_gesture("camera", hand_id)) for hand_id in observations]
+    stable = [(hand_id, gesture) for hand_id, gesture in stable if gesture]
+    if len(stable) == 1:
+        packet.status_text = STATUS_TEXTS.get(stable[0][1], stable[0][1])
+    elif stable:
+        packet.status_text = " | ".join(f"{hand_tracker.label(h)}: {STATUS_TEXTS.get(g, g)}" for h, g in stable)
+
+    last_status_text = packet.status_text
+    now = time.perf_counter()
+    metrics.observe("latency", now - packet.captured_at)
+    if motion_gate and motion_gate.woke:
+        # Dari capture frame bergerak pertama sampai hasil inferensinya siap
+        metrics.observe("wake_latency", now - packet.captured_at)
+        metrics.increment("motion_wakeups")
+    if scheduler:
+        scheduler.observe("inference", now - start)
+        scheduler.observe("latency", now - packet.captured_at)
+        scheduler.update()
+
+    return packet
 
-# --- Main Application Logic (runs after port is selected) ---
 def start_hand_pose_detection(selected_port):
-    global arduino, cap, is_running, prev_hand_state
+    global arduino, cap, is_running, scheduler, recorder, rgb_pool, scaled_pool
 
+    startup_timer.mark("port dikonfirmasi")
     try:
-        arduino = serial.Serial(selected_port, 9600, timeout=1)
-        print(f"Koneksi serial ke Arduino berhasil di port {selected_port}!")
-        time.sleep(2)
-    except serial.SerialException:
+        model_loader.result() # Biasanya sudah selesai selagi port dipilih
+    except Exception as e:
+        messagebox.showerror("Error Model", f"Gagal memuat MediaPipe: {e}")
+        return
+    startup_timer.mark("model siap dipakai")
+
+    # Koneksi serial dan jeda reset Arduino ditangani thread SerialWriter;
+    # di sini hanya ditunggu sampai port berhasil dibuka.
+    arduino = SerialWriter(selected_port, 9600, ack=SERIAL_ACK, metrics=metrics, relays=RELAY_CHANNELS,
+                           protocol=SERIAL_PROTOCOL, binary_baudrate=SERIAL_BINARY_BAUDRATE)
+    arduino.start()
+    if not arduino.wait_first_attempt(timeout=5):
+        arduino.close()
+        arduino = None
         messagebox.showerror("Error Serial", f"Gagal terhubung ke Arduino di {selected_port}.")
         return
 
-    cap = cv2.VideoCapture(0)
+    if isinstance(CAMERA_SOURCE, str):
+        cap = VideoReplaySource(CAMERA_SOURCE)
+    else:
+        cap = cv2.VideoCapture(CAMERA_SOURCE)
     if not cap.isOpened():
         messagebox.showerror("Error Kamera", "Gagal membuka kamera.")
         if arduino: arduino.close()
         return
 
     is_running = True
-    prev_hand_state = None
+    arbiter.reset()
+    hand_tracker.reset()
+    roi_tracker.reset()
+    if landmark_smoother:
+        landmark_smoother.reset()
+    if motion_gate:
+        motion_gate.reset()
     print("Program dimulai. Tekan 'q' untuk keluar.")
 
-    while is_running and cap.isOpened():
-        success, image = cap.read()
-        if not success: break
-
-        image = cv2.flip(image, 1)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = hands.process(image_rgb)
-
-        status_text = "Arahkan tangan ke kamera"
-
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                
-                current_command = get_gesture_command(hand_landmarks)
-
-                if current_command and current_command != prev_hand_state:
-                    command_to_send = current_command
-                    
-                    if command_to_send == "ON":
-                        status_text = "on lamp"
-                    elif command_to_send == "OFF":
-                        status_text = "off lamp"
-                    elif command_to_send == 'O':
-                        status_text = "open pintu"
-                    elif command_to_send == 'C':
-                        status_text = "close"
-
-                    print(f"Mengirim: '{command_to_send}' -> {status_text}")
-                    if arduino:
-                        try:
-                            arduino.write(f"{command_to_send}\n".encode('utf-8'))
-                        except serial.SerialException as e:
-                            messagebox.showerror("Serial Error", f"Komunikasi serial terputus: {e}")
-                            is_running = False
-                            break
-                    prev_hand_state = current_command
-
+    # Pipeline bertahap: capture -> inferensi -> (render, SerialWriter).
+    # Semua antrian berukuran kecil dan membuang frame lama saat penuh.
+    stop_event = threading.Event()
+    # Frame kamera dipinjam dari free-list capture_pool dan dikembalikan saat
+    # dibuang antrian atau setelah di-flip untuk display; buffer lain hanya
+    # dipakai satu thread secara berurutan.
+    frame_queue = LatestQueue(maxsize=1, on_drop=FramePacket.release)
+    render_queue = LatestQueue(maxsize=1, on_drop=FramePacket.release)
+    capture_pool = FrameBufferPool(slots=4)
+    rgb_pool = FrameBufferPool()
+    scaled_pool = FrameBufferPool()
+    display_pool = FrameBufferPool()
+    capture_worker = CaptureWorker(cap, frame_queue, stop_event, pool=capture_pool)
+    if USE_ADAPTIVE_SCHEDULER:
+        # Mulai dari mode asli kamera; resolusi hanya diubah saat scheduler menurunkannya
+        native = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        scheduler = AdaptiveScheduler(
+            target_latency=TARGET_LATENCY,
+            resolution_setter=capture_worker.request_resolution,
+            initial_resolution=native if all(native) else None
+        )
+
+    def on_capture(seconds):
+        metrics.observe("capture", seconds)
+        if scheduler:
+            scheduler.observe("capture", seconds)
+    if scheduler or metrics.enabled:
+        capture_worker.on_read = on_capture
+    inference_worker = StageWorker("inference", process_frame, frame_queue, render_queue, stop_event)
+    workers = [capture_worker, inference_worker]
+    if RECORD_LANDMARKS:
+        from recording import LandmarkRecorder
+        recorder = LandmarkRecorder(RECORD_LANDMARKS)
+        recorder.start()
+    for worker in workers:
+        worker.start()
+
+    exporters = []
+    if metrics.enabled and METRICS_PORT:
+        try:
+            exporters.append(MetricsServer(metrics, port=METRICS_PORT))
+            print(f"Metrik tersedia di http://127.0.0.1:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"Gagal membuka endpoint metrik di port {METRICS_PORT}: {e}")
+    if metrics.enabled and METRICS_FILE:
+        exporters.append(MetricsFileExporter(metrics, METRICS_FILE))
+    for exporter in exporters:
+        exporter.start()
+
+    # Render tetap di thread utama karena cv2.imshow/waitKey tidak aman dari thread lain
+    first_frame_shown = False
+    while is_running:
+        packet = render_queue.get(timeout=0.1)
+        if packet is None:
+            if render_queue.closed or stop_event.is_set():
+                break
         else:
-            prev_hand_state = None
-            status_text = "Tidak ada tangan terdeteksi"
-
-        cv2.putText(image, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv2.LINE_AA)
-        cv2.imshow('Hand Pose Detection', image)
+            render_start = time.perf_counter()
+            # Mirror piksel hanya untuk frame yang benar-benar ditampilkan;
+            # landmark di packet sudah di-mirror jadi langsung cocok
+            with metrics.timer("draw"):
+                image = cv2.flip(packet.image, 1, dst=display_pool.get(packet.image.shape))
+                packet.release()
+                if packet.landmarks is not None and len(packet.landmarks):
+                    draw_landmarks(image, packet.landmarks)
+                cv2.putText(image, packet.status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2, cv2.LINE_AA)
+            with metrics.timer("display"):
+                cv2.imshow('Hand Pose Detection', image)
+            if scheduler:
+                scheduler.observe("render", time.perf_counter() - render_start)
+            if not first_frame_shown:
+                first_frame_shown = True
+                startup_timer.mark("frame pertama ditampilkan")
+                startup_timer.print_report()
+                if STARTUP_REPORT_FILE:
+                    startup_timer.save(STARTUP_REPORT_FILE)
 
         if cv2.waitKey(1) & 0xFF == ord('q'):
             is_running = False
 
+    is_running = False
+    stop_event.set()
+    for worker in workers:
+        worker.join(timeout=2)
+    for exporter in exporters:
+        exporter.stop()
+    metrics.increment("frames_dropped", frame_queue.dropped + render_queue.dropped)
+
+    if inference_worker.error is not None:
+        print(f"Tahap inferensi berhenti karena error: {inference_worker.error}")
+
+    if USE_ROI_TRACKING:
+        print(f"Statistik ROI tracking: {roi_tracker.stats()}")
+    roi_tracker.close()
+    if motion_gate:
+        print(f"Statistik gerbang gerakan: {motion_gate.stats()}")
+    if recorder:
+        recorder.close()
+        print(f"Rekaman landmark: {recorder.records_written} frame ditulis ke {recorder.path}, {recorder.dropped} dibuang.")
+        recorder = None
+
     # Cleanup
     print("Membersihkan sumber daya...")
     if arduino:
@@ -200,6 +484,10 @@ root.withdraw() # Sembunyikan jendela utama Tkinter saat startup
 
 # Panggil fungsi untuk membuat jendela pemilihan port
 create_port_selection_window()
+root.after_idle(lambda: startup_timer.mark("jendela port tampil"))
+
+# Muat modul berat dan model di latar belakang selagi pengguna memilih port
+model_loader.start()
 
 # Jika jendela pemilihan port ditutup secara paksa, pastikan aplikasi keluar
 root.protocol("WM_DELETE_WINDOW", lambda: root.destroy()) # Handle window close for root
@@ -213,4 +501,5 @@ if arduino:
 if cap:
     cap.release()
     print("Kamera dilepaskan (dari cleanup akhir).")
-cv2.destroyAllWindows()
\ No newline at end of file
+if cv2:
+    cv2.destroyAllWindows()
\ No newline at end of file
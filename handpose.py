@@ -1,8 +1,12 @@
 import cv2
 import mediapipe as mp
+import os
 import serial
 import time
 
+from gestures import load_registry
+from landmarks import landmarks_to_array, handedness_to_is_left
+
 # --- Konfigurasi Serial Arduino ---
 # Ganti 'COM3' dengan port serial Arduino kamu (misal: '/dev/ttyACM0' di Linux/Mac)
 # Pastikan baud rate (9600) sama dengan yang diatur di kode Arduino
@@ -26,57 +30,31 @@ mp_draw = mp.solutions.drawing_utils
 # --- Inisialisasi Kamera ---
 cap = cv2.VideoCapture(0) # 0 adalah ID kamera default, ganti jika punya lebih dari satu kamera
 
+# --- Registry Status Tangan ---
+# Registry terpisah dari gestures.json karena skrip ini hanya butuh 'open'/'closed':
+# minimal 4 jari terbuka = 'open', jempol terbuka jika ujungnya bergeser lebih dari
+# thumb_threshold_x (0.05) dari sendinya ke arah mana pun. Ambangnya ada di
+# handpose_gestures.json.
+HAND_STATE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "handpose_gestures.json")
+hand_state_registry = load_registry(HAND_STATE_CONFIG, default={
+    "thumb_threshold_x": 0.05,
+    "gestures": [{"name": "open", "min_open": 4}, {"name": "closed", "default": True}],
+})
+
 # Variabel untuk melacak status jari sebelumnya
 prev_hand_state = None # 'open' atau 'closed'
 
-def get_hand_state(hand_landmarks):
-    # Mengidentifikasi apakah jari-jari terbuka atau tertutup
-    # Kita akan memeriksa ujung jari (tip) dan sendi di bawahnya (PIP)
-    # Indeks landmark jari tangan:
-    # Jempol: 4 (tip), 3 (PIP)
-    # Telunjuk: 8 (tip), 7 (PIP)
-    # Tengah: 12 (tip), 11 (PIP)
-    # Cincin: 16 (tip), 15 (PIP)
-    # Kelingking: 20 (tip), 19 (PIP)
-
-    # Logika sederhana: jika ujung jari (tip) lebih tinggi (y lebih kecil) dari sendi PIP-nya,
-    # maka jari dianggap terbuka. Khusus jempol, periksa sumbu x relatif.
-
-    # Ambang batas untuk jempol (perlu disesuaikan jika tidak bekerja dengan baik)
-    thumb_threshold_x = 0.05 # Perbedaan koordinat x yang cukup besar untuk jempol
-
-    # Memeriksa jari-jari selain jempol (jari 8, 12, 16, 20)
-    # Jika ujung jari (tip) lebih tinggi dari sendi PIP-nya, jari dianggap terbuka
-    fingers_open = 0
-    # Jari telunjuk (8 vs 7)
-    if hand_landmarks.landmark[8].y < hand_landmarks.landmark[7].y:
-        fingers_open += 1
-    # Jari tengah (12 vs 11)
-    if hand_landmarks.landmark[12].y < hand_landmarks.landmark[11].y:
-        fingers_open += 1
-    # Jari manis (16 vs 15)
-    if hand_landmarks.landmark[16].y < hand_landmarks.landmark[15].y:
-        fingers_open += 1
-    # Jari kelingking (20 vs 19)
-    if hand_landmarks.landmark[20].y < hand_landmarks.landmark[19].y:
-        fingers_open += 1
-
-    # Memeriksa jempol (4 vs 3) - logikanya sedikit berbeda, berdasarkan sumbu X
-    # Jika jempol terbuka, koordinat x ujung jempol (4) biasanya akan lebih jauh dari sendi jempol (3)
-    # dalam arah yang berlawanan dengan telapak tangan
-    if hand_landmarks.landmark[4].x < hand_landmarks.landmark[3].x - thumb_threshold_x or \
-       hand_landmarks.landmark[4].x > hand_landmarks.landmark[3].x + thumb_threshold_x:
-        # Ini adalah logika yang sangat disederhanakan.
-        # Untuk akurasi lebih tinggi, perlu mempertimbangkan orientasi tangan.
-        # Untuk sekarang, kita asumsikan jempol terbuka jika x-nya jauh dari basisnya.
-        fingers_open += 1
-
-
-    # Jika semua 5 jari terbuka
-    if fingers_open >= 4: # Menggunakan 4 atau 5 untuk toleransi
-        return 'open'
-    else:
-        return 'closed'
+def get_hand_states(multi_hand_landmarks, multi_handedness=None):
+    # Mengidentifikasi apakah tangan terbuka atau tertutup untuk semua tangan sekaligus.
+    # Landmark semua tangan diubah sekali menjadi array (tangan, 21, 3), lalu
+    # diklasifikasikan oleh hand_state_registry (lihat handpose_gestures.json).
+    # Gambar sudah di-flip sebelum inferensi, jadi label handedness dipakai apa adanya.
+    coords = landmarks_to_array(multi_hand_landmarks)
+    is_left = handedness_to_is_left(multi_handedness, len(coords))
+    return hand_state_registry.classify(coords, is_left)
+
+def get_hand_state(hand_landmarks, handedness=None):
+    return get_hand_states([hand_landmarks], [handedness] if handedness else None)[0]
 
 print("Program Python dimulai. Tekan 'q' untuk keluar.")
 
@@ -97,11 +75,10 @@ while cap.isOpened():
 
     # Gambar landmark jika tangan terdeteksi
     if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
+        hand_states = get_hand_states(results.multi_hand_landmarks, results.multi_handedness)
+        for hand_landmarks, current_hand_state in zip(results.multi_hand_landmarks, hand_states):
             mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-            current_hand_state = get_hand_state(hand_landmarks)
-
             if current_hand_state != prev_hand_state:
                 if current_hand_state == 'open':
                     command = 'O'
@@ -0,0 +1,129 @@
+import numpy as np
+from itertools import chain
+
+# Indeks landmark MediaPipe Hands (21 titik per tangan)
+NUM_LANDMARKS = 21
+WRIST = 0
+
+# Ujung jari (tip) dan sendi di bawahnya, urutan: jempol, telunjuk, tengah, manis, kelingking
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([3, 7, 11, 15, 19])
+FINGER_NAMES = ["thumb", "index", "middle", "ring", "pinky"]
+FINGER_BITS = np.array([1, 2, 4, 8, 16], dtype=np.uint8)
+
+# Rantai sendi tiap jari dari pergelangan sampai ujung, dipakai untuk menghitung sudut sendi
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """
+    Mengubah daftar `NormalizedLandmarkList` MediaPipe menjadi satu array
+    float32 kontigu berbentuk (tangan, 21, 3). Akses atribut protobuf hanya
+    terjadi di sini, satu kali per frame.
+    """
+    if not multi_hand_landmarks:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+
+    coords = np.empty((len(multi_hand_landmarks), NUM_LANDMARKS, 3), dtype=np.float32)
+    for h, hand_landmarks in enumerate(multi_hand_landmarks):
+        coords[h] = np.fromiter(
+            chain.from_iterable((p.x, p.y, p.z) for p in hand_landmarks.landmark),
+            dtype=np.float32, count=NUM_LANDMARKS * 3
+        ).reshape(NUM_LANDMARKS, 3)
+    return coords
+
+
+def handedness_to_is_left(multi_handedness, num_hands=None, mirrored=True):
+    """
+    Mengubah `multi_handedness` MediaPipe menjadi array bool (tangan,),
+    True untuk tangan kiri. Tanpa data handedness semua tangan dianggap kanan.
+    MediaPipe mengasumsikan frame masukan sudah di-mirror; jika frame diproses
+    tanpa mirror (`mirrored=False`, lihat `mirror_landmarks`), labelnya dibalik
+    supaya tetap sesuai dengan tangan asli pengguna.
+    """
+    if not multi_handedness:
+        return np.zeros(num_hands or 0, dtype=bool)
+    return np.array([h.classification[0].label == "Left" for h in multi_handedness], dtype=bool) == mirrored
+
+
+def handedness_labels(multi_handedness, mirrored=True):
+    """Label "Left"/"Right" per tangan, dengan koreksi yang sama seperti `handedness_to_is_left`."""
+    return ["Left" if left else "Right" for left in handedness_to_is_left(multi_handedness, mirrored=mirrored)]
+
+
+def mirror_landmarks(coords):
+    """
+    Mirror horizontal di ruang landmark (x -> 1 - x), in place. Menggantikan
+    `cv2.flip` pada piksel: frame diproses apa adanya, lalu hanya 63 nilai per
+    tangan yang dibalik sehingga hasil klasifikasi sama dengan frame yang di-flip.
+    """
+    coords[..., 0] = 1.0 - coords[..., 0]
+    return coords
+
+
+def finger_open_states(coords, thumb_threshold_x=None, is_left=None, thumb_margin=0.0):
+    """
+    Status terbuka tiap jari untuk semua tangan sekaligus, hasil (tangan, 5) bool.
+    Jari selain jempol terbuka jika ujungnya lebih tinggi (y lebih kecil) dari sendinya.
+    Jempol memakai sumbu x: ujung harus lebih jauh dari `thumb_margin` ke arah luar
+    telapak (kiri untuk tangan kanan, kanan untuk tangan kiri; tanpa `is_left`
+    semua tangan dianggap kanan). Dengan `thumb_threshold_x`, jempol cukup jauh
+    dari sendinya ke arah mana pun.
+    """
+    tips = coords[:, FINGER_TIPS]
+    pips = coords[:, FINGER_PIPS]
+
+    states = tips[:, :, 1] < pips[:, :, 1]
+    thumb_dx = tips[:, 0, 0] - pips[:, 0, 0]
+    if thumb_threshold_x is not None:
+        states[:, 0] = np.abs(thumb_dx) > thumb_threshold_x
+    elif is_left is None:
+        states[:, 0] = thumb_dx < -thumb_margin
+    else:
+        states[:, 0] = np.where(is_left, thumb_dx > thumb_margin, thumb_dx < -thumb_margin)
+    return states
+
+
+def finger_masks(states):
+    """
+    Mengubah status (tangan, 5) menjadi mask 5-bit per tangan:
+    bit 0 jempol, bit 1 telunjuk, bit 2 tengah, bit 3 manis, bit 4 kelingking.
+    """
+    return states.astype(np.uint8) @ FINGER_BITS
+
+
+def joint_angles(coords):
+    """
+    Sudut (radian) di tiap sendi jari, hasil (tangan, 5, 3). Sudut pi berarti
+    ruas jari lurus, makin kecil berarti makin menekuk.
+    """
+    points = coords[:, FINGER_CHAINS] # (tangan, 5, 5, 3)
+    incoming = points[:, :, :-2] - points[:, :, 1:-1]
+    outgoing = points[:, :, 2:] - points[:, :, 1:-1]
+
+    dot = np.einsum('hfjc,hfjc->hfj', incoming, outgoing)
+    norms = np.linalg.norm(incoming, axis=-1) * np.linalg.norm(outgoing, axis=-1)
+    cosine = dot / np.maximum(norms, 1e-6)
+    return np.arccos(np.clip(cosine, -1.0, 1.0))
+
+
+def fingertip_distances(coords):
+    """
+    Jarak antar ujung jari untuk semua tangan, hasil (tangan, 5, 5).
+    """
+    tips = coords[:, FINGER_TIPS]
+    diff = tips[:, :, None, :] - tips[:, None, :, :]
+    return np.linalg.norm(diff, axis=-1)
+
+
+def palm_size(coords):
+    """
+    Jarak pergelangan ke pangkal jari tengah, dipakai untuk menormalkan jarak lain.
+    """
+    return np.linalg.norm(coords[:, 9] - coords[:, WRIST], axis=-1)
@@ -0,0 +1,309 @@
+"""
+Klasifikasi gestur berbasis data sebagai alternatif aturan di gestures.json.
+Landmark dinormalisasi (translasi, skala, rotasi, dan mirror tangan kiri)
+menjadi vektor 63 dimensi, lalu diklasifikasikan dengan nearest-centroid atau
+MLP kecil murni NumPy, jadi tetap ringan di CPU.
+
+Contoh:
+    python learned_classifier.py record --out samples.npz
+    python learned_classifier.py train samples.npz --kind mlp --out gesture_model.npz
+    python learned_classifier.py bench samples.npz --model gesture_model.npz
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, WRIST
+
+MIDDLE_MCP = 9
+
+
+def normalize_landmarks(coords, is_left=None):
+    """
+    Mengubah (tangan, 21, 3) menjadi (tangan, 63) yang tidak bergantung pada
+    posisi, ukuran, dan rotasi tangan di gambar: pergelangan dipindah ke titik
+    nol, sumbu pergelangan -> pangkal jari tengah diputar menghadap ke atas,
+    lalu diskalakan dengan panjang sumbu tersebut. Tangan kiri di-mirror supaya
+    satu model berlaku untuk kedua tangan.
+    """
+    coords = np.asarray(coords, dtype=np.float32)
+    centered = coords - coords[:, WRIST:WRIST + 1]
+    if is_left is not None:
+        centered = centered * np.where(np.asarray(is_left)[:, None, None], [-1.0, 1.0, 1.0], 1.0).astype(np.float32)
+
+    axis = centered[:, MIDDLE_MCP, :2]
+    length = np.maximum(np.linalg.norm(axis, axis=1), 1e-6)
+    # Rotasi 2D supaya sumbu telapak mengarah ke (0, -1), yaitu ke atas di koordinat gambar
+    cos = -axis[:, 1] / length
+    sin = -axis[:, 0] / length
+    x, y = centered[:, :, 0], centered[:, :, 1]
+    rotated = np.stack([
+        cos[:, None] * x - sin[:, None] * y,
+        sin[:, None] * x + cos[:, None] * y,
+        centered[:, :, 2],
+    ], axis=-1)
+    return (rotated / length[:, None, None]).reshape(len(coords), NUM_LANDMARKS * 3)
+
+
+class NearestCentroidClassifier:
+    """Satu centroid per kelas; prediksi = centroid terdekat (jarak Euclid)."""
+
+    kind = "centroid"
+
+    def fit(self, features, labels):
+        self.classes = np.array(sorted(set(labels)))
+        labels = np.asarray(labels)
+        self.centroids = np.stack([features[labels == c].mean(axis=0) for c in self.classes]).astype(np.float32)
+        self._centroid_sq = (self.centroids ** 2).sum(axis=1)
+        return self
+
+    def predict_index(self, features):
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 sama untuk semua kelas jadi diabaikan
+        return np.argmin(self._centroid_sq - 2.0 * features @ self.centroids.T, axis=1)
+
+    def state(self):
+        return {"centroids": self.centroids}
+
+    def load_state(self, state):
+        self.centroids = state["centroids"]
+        self._centroid_sq = (self.centroids ** 2).sum(axis=1)
+
+
+class TinyMLP:
+    """MLP satu hidden layer (ReLU + softmax), dilatih dengan Adam mini-batch."""
+
+    kind = "mlp"
+
+    def __init__(self, hidden=32, epochs=200, learning_rate=0.01, batch_size=64, seed=0):
+        self.hidden = hidden
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.seed = seed
+
+    def fit(self, features, labels):
+        rng = np.random.default_rng(self.seed)
+        self.classes = np.array(sorted(set(labels)))
+        targets = np.searchsorted(self.classes, labels)
+        n, d = features.shape
+        k = len(self.classes)
+
+        params = {
+            "w1": (rng.standard_normal((d, self.hidden)) * np.sqrt(2.0 / d)).astype(np.float32),
+            "b1": np.zeros(self.hidden, dtype=np.float32),
+            "w2": (rng.standard_normal((self.hidden, k)) * np.sqrt(1.0 / self.hidden)).astype(np.float32),
+            "b2": np.zeros(k, dtype=np.float32),
+        }
+        moments = {name: (np.zeros_like(p), np.zeros_like(p)) for name, p in params.items()}
+        beta1, beta2, step = 0.9, 0.999, 0
+
+        for _ in range(self.epochs):
+            order = rng.permutation(n)
+            for start in range(0, n, self.batch_size):
+                batch = order[start:start + self.batch_size]
+                x, t = features[batch], targets[batch]
+
+                hidden = np.maximum(x @ params["w1"] + params["b1"], 0.0)
+                logits = hidden @ params["w2"] + params["b2"]
+                probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+                probs /= probs.sum(axis=1, keepdims=True)
+
+                grad_logits = probs
+                grad_logits[np.arange(len(batch)), t] -= 1.0
+                grad_logits /= len(batch)
+                grad_hidden = (grad_logits @ params["w2"].T) * (hidden > 0)
+                grads = {
+                    "w2": hidden.T @ grad_logits, "b2": grad_logits.sum(axis=0),
+                    "w1": x.T @ grad_hidden, "b1": grad_hidden.sum(axis=0),
+                }
+
+                step += 1
+                for name, grad in grads.items():
+                    m, v = moments[name]
+                    m *= beta1
+                    m += (1 - beta1) * grad
+                    v *= beta2
+                    v += (1 - beta2) * grad ** 2
+                    m_hat = m / (1 - beta1 ** step)
+                    v_hat = v / (1 - beta2 ** step)
+                    params[name] -= (self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+
+        self.load_state(params)
+        return self
+
+    def predict_index(self, features):
+        hidden = np.maximum(features @ self.w1 + self.b1, 0.0)
+        return np.argmax(hidden @ self.w2 + self.b2, axis=1)
+
+    def state(self):
+        return {"w1": self.w1, "b1": self.b1, "w2": self.w2, "b2": self.b2}
+
+    def load_state(self, state):
+        self.w1, self.b1, self.w2, self.b2 = (np.asarray(state[k], dtype=np.float32) for k in ("w1", "b1", "w2", "b2"))
+
+
+MODEL_KINDS = {"centroid": NearestCentroidClassifier, "mlp": TinyMLP}
+
+
+class LearnedGestureClassifier:
+    """
+    Pembungkus model agar antarmukanya sama dengan `GestureRegistry.classify`,
+    sehingga bisa dipasang lewat `gestures.use_classifier()`.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    def classify(self, coords, is_left=None):
+        if len(coords) == 0:
+            return []
+        indices = self.model.predict_index(normalize_landmarks(coords, is_left))
+        return self.model.classes[indices].tolist()
+
+    def save(self, path):
+        np.savez(path, kind=self.model.kind, classes=self.model.classes, **self.model.state())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            model = MODEL_KINDS[str(data["kind"])]()
+            model.classes = data["classes"]
+            model.load_state({k: data[k] for k in data.files if k not in ("kind", "classes")})
+        return cls(model)
+
+
+def load_samples(path):
+    """Sampel rekaman: landmarks (N, 21, 3), is_left (N,), labels (N,)."""
+    with np.load(path, allow_pickle=False) as data:
+        return data["landmarks"].astype(np.float32), data["is_left"].astype(bool), data["labels"].astype(str)
+
+
+def save_samples(path, landmarks, is_left, labels):
+    np.savez_compressed(path, landmarks=np.asarray(landmarks, dtype=np.float32),
+                        is_left=np.asarray(is_left, dtype=bool), labels=np.asarray(labels, dtype=str))
+
+
+def train(samples_path, kind="mlp", out_path="gesture_model.npz", validation=0.2, seed=0):
+    landmarks, is_left, labels = load_samples(samples_path)
+    features = normalize_landmarks(landmarks, is_left)
+    order = np.random.default_rng(seed).permutation(len(labels))
+    split = int(len(order) * (1 - validation))
+    train_idx, val_idx = order[:split], order[split:]
+
+    model = MODEL_KINDS[kind]().fit(features[train_idx], labels[train_idx])
+    classifier = LearnedGestureClassifier(model)
+    classifier.save(out_path)
+
+    def accuracy(idx):
+        if len(idx) == 0:
+            return None
+        return float((model.classes[model.predict_index(features[idx])] == labels[idx]).mean())
+
+    print(f"Model {kind} disimpan ke {out_path} ({len(model.classes)} kelas: {', '.join(model.classes)})")
+    val_accuracy = accuracy(val_idx)
+    val_text = "-" if val_accuracy is None else f"{val_accuracy:.1%}"
+    print(f"Akurasi latih: {accuracy(train_idx):.1%}  validasi: {val_text}")
+    return classifier
+
+
+def bench(samples_path, model_path, repeats=200):
+    """
+    Membandingkan akurasi dan biaya per tangan antara model terlatih dan
+    aturan di gestures.json, memakai sampel berlabel yang sama.
+    """
+    from gestures import registry
+
+    landmarks, is_left, labels = load_samples(samples_path)
+    learned = LearnedGestureClassifier.load(model_path)
+    for name, classifier in (("aturan (gestures.json)", registry), ("model terlatih", learned)):
+        predictions = np.array(classifier.classify(landmarks, is_left))
+        accuracy = float((predictions == labels).mean())
+
+        # Biaya per tangan diukur dengan memanggil satu tangan per panggilan, seperti di loop live
+        single = landmarks[:1], is_left[:1]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            classifier.classify(*single)
+        per_hand_us = (time.perf_counter() - start) / repeats * 1e6
+        print(f"{name:<24} akurasi={accuracy:.3f}  biaya={per_hand_us:.1f} us/tangan")
+
+
+def record(out_path, camera=0, commands=("ON", "OFF", "O", "C")):
+    """
+    Merekam sampel berlabel dari kamera live. Tekan angka 1..N untuk memilih
+    label, 'r' untuk mulai/berhenti merekam, 'q' untuk menyimpan dan keluar.
+    """
+    import cv2
+    import mediapipe as mp
+    from landmarks import landmarks_to_array, handedness_to_is_left
+
+    hands = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+    cap = cv2.VideoCapture(camera)
+    samples, lefts, labels = [], [], []
+    if os.path.exists(out_path):
+        old = load_samples(out_path)
+        samples, lefts, labels = list(old[0]), list(old[1]), list(old[2])
+
+    label, recording = commands[0], False
+    print(f"Label: {', '.join(f'{i + 1}={c}' for i, c in enumerate(commands))}. 'r' rekam, 'q' simpan & keluar.")
+    while cap.isOpened():
+        success, image = cap.read()
+        if not success:
+            break
+        image = cv2.flip(image, 1)
+        results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if recording and results.multi_hand_landmarks:
+            coords = landmarks_to_array(results.multi_hand_landmarks)
+            samples.extend(coords)
+            lefts.extend(handedness_to_is_left(results.multi_handedness, len(coords)))
+            labels.extend([label] * len(coords))
+
+        status = f"Label: {label}  {'REKAM' if recording else 'jeda'}  sampel: {len(labels)}"
+        cv2.putText(image, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255) if recording else (0, 255, 0), 2, cv2.LINE_AA)
+        cv2.imshow('Rekam Gestur', image)
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            break
+        if key == ord('r'):
+            recording = not recording
+        elif ord('1') <= key < ord('1') + len(commands):
+            label = commands[key - ord('1')]
+
+    cap.release()
+    cv2.destroyAllWindows()
+    if labels:
+        save_samples(out_path, samples, lefts, labels)
+        print(f"{len(labels)} sampel disimpan ke {out_path}.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rekam, latih, dan benchmark klasifikasi gestur berbasis data.")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    p = sub.add_parser("record", help="Rekam sampel landmark berlabel dari kamera")
+    p.add_argument("--out", default="samples.npz")
+    p.add_argument("--camera", type=int, default=0)
+
+    p = sub.add_parser("train", help="Latih model dari sampel")
+    p.add_argument("samples")
+    p.add_argument("--kind", choices=sorted(MODEL_KINDS), default="mlp")
+    p.add_argument("--out", default="gesture_model.npz")
+
+    p = sub.add_parser("bench", help="Bandingkan model dengan aturan bawaan")
+    p.add_argument("samples")
+    p.add_argument("--model", default="gesture_model.npz")
+
+    args = parser.parse_args(argv)
+    if args.action == "record":
+        record(args.out, args.camera)
+    elif args.action == "train":
+        train(args.samples, args.kind, args.out)
+    else:
+        bench(args.samples, args.model)
+
+
+if __name__ == "__main__":
+    main()
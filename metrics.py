@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas atas bucket histogram (detik), mengikuti konvensi histogram Prometheus
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """
+    Histogram waktu satu tahap. Menyimpan hitungan kumulatif per bucket
+    (untuk Prometheus) dan ring buffer `window` sampel terakhir untuk
+    persentil bergulir, jadi tidak ada satu baris output per frame.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=1024):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1) # Bucket terakhir = +Inf
+        self.count = 0
+        self.total = 0.0
+        self._window = [0.0] * window
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self._window[self._pos % len(self._window)] = seconds
+            self._pos += 1
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._window[:min(self._pos, len(self._window))])
+            bucket_counts = list(self.bucket_counts)
+            count, total = self.count, self.total
+
+        def pct(q):
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000.0, 3)
+
+        return {
+            "count": count,
+            "sum_seconds": total,
+            "mean_ms": round(total / count * 1000.0, 3) if count else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(recent[-1] * 1000.0, 3) if recent else None,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], bucket_counts)),
+        }
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Registry histogram per tahap pipeline (capture, convert, inference,
+    classify, draw, serial_write, display, ...). Histogram dibuat otomatis
+    saat tahap pertama kali dicatat.
+    """
+
+    enabled = True
+
+    def __init__(self, window=1024):
+        self.window = window
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def _histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, Histogram(window=self.window))
+        return histogram
+
+    def timer(self, stage):
+        """Context manager yang mengukur durasi blok ke histogram `stage`."""
+        return _Timer(self._histogram(stage))
+
+    def observe(self, stage, seconds):
+        self._histogram(stage).observe(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Nilai sesaat (misalnya duty cycle), ditimpa setiap kali dicatat."""
+        self.gauges[name] = value
+
+    def snapshot(self):
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "stages": {stage: h.snapshot() for stage, h in sorted(self.histograms.items())},
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="handpose"):
+        """Format teks eksposisi Prometheus."""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# HELP {metric} Durasi tiap tahap pipeline per frame.")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, histogram in sorted(self.histograms.items()):
+            snap = histogram.snapshot()
+            cumulative = 0
+            for bound, count in snap["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {snap["sum_seconds"]}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {snap["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+class NullMetrics:
+    """
+    Pengganti `Metrics` saat instrumentasi dimatikan. Semua pemanggilan
+    menjadi no-op tanpa alokasi, jadi biayanya mendekati nol di hot path.
+    """
+
+    enabled = False
+
+    def timer(self, stage):
+        return _NULL_TIMER
+
+    def observe(self, stage, seconds):
+        pass
+
+    def increment(self, name, amount=1):
+        pass
+
+    def set_gauge(self, name, value):
+        pass
+
+    def snapshot(self):
+        return {}
+
+    def to_json(self):
+        return "{}"
+
+    def to_prometheus(self, prefix="handpose"):
+        return ""
+
+
+class MetricsServer(threading.Thread):
+    """
+    Endpoint HTTP lokal: `/metrics` (teks Prometheus) dan `/metrics.json`.
+    Secara default hanya mendengarkan di 127.0.0.1.
+    """
+
+    def __init__(self, metrics, port=9108, host="127.0.0.1"):
+        super().__init__(name="metrics-server", daemon=True)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = metrics.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass # Jangan membanjiri stdout dengan log setiap request
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+
+    def run(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsFileExporter(threading.Thread):
+    """
+    Menulis snapshot metrik ke file secara berkala (JSON atau Prometheus,
+    ditentukan dari ekstensi `.prom`). File ditulis ulang secara atomik.
+    """
+
+    def __init__(self, metrics, path, interval=5.0):
+        super().__init__(name="metrics-file", daemon=True)
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def write(self):
+        body = self.metrics.to_prometheus() if self.path.endswith(".prom") else self.metrics.to_json()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp_path, self.path)
+
+    def stop(self):
+        self._stop_event.set()
+        self.write()
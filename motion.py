@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Gerbang murah sebelum inferensi untuk instalasi yang menyala terus.
+    Setiap frame dikecilkan menjadi thumbnail abu-abu (`size`) dan
+    dibandingkan dengan background yang diperbarui perlahan; skor gerakan
+    adalah fraksi piksel yang berubah lebih dari `pixel_threshold`.
+
+    Jika tidak ada gerakan dan tidak ada tangan selama `idle_after` detik,
+    pipeline masuk mode idle dan hanya satu frame per `idle_interval` detik
+    yang diteruskan ke inferensi. Frame pertama yang bergerak langsung
+    diteruskan (bangun dalam satu frame) dan `woke` bernilai True untuk frame
+    itu. Tangan yang ditemukan pada frame sampel idle juga membangunkan pipeline.
+    """
+
+    def __init__(self, size=(64, 48), pixel_threshold=12, min_changed=0.01, idle_after=3.0,
+                 idle_interval=1.0, background_alpha=0.1):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.background_alpha = background_alpha
+        self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self.reset()
+
+    def reset(self):
+        self.idle = False
+        self.woke = False
+        self.score = 0.0
+        self.duty_cycle = 1.0 # Rata-rata bergerak fraksi frame yang diteruskan ke inferensi
+        self.frames = 0
+        self.processed = 0
+        self.wakeups = 0
+        self._background = None
+        self._last_activity = None
+        self._last_processed = float("-inf")
+
+    def _thumbnail(self, image):
+        # Ambil sampel berjarak dulu supaya INTER_AREA hanya merata-rata beberapa ribu piksel,
+        # bukan seluruh frame (di 1080p selisihnya sekitar 8 ms vs 0.5 ms)
+        step = max(1, min(image.shape[1] // (self.size[0] * 4), image.shape[0] // (self.size[1] * 4)))
+        cv2.resize(image[::step, ::step], self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+    def update(self, image, now):
+        """Mengembalikan True jika frame ini perlu diproses `hands.process`."""
+        gray = self._thumbnail(image)
+        if self._background is None:
+            self._background = gray.astype(np.float32)
+            motion = True
+        else:
+            changed = np.abs(gray - self._background) > self.pixel_threshold
+            self.score = float(np.count_nonzero(changed)) / changed.size
+            motion = self.score >= self.min_changed
+            cv2.accumulateWeighted(gray, self._background, self.background_alpha)
+
+        if motion:
+            self._last_activity = now
+        active = self._last_activity is not None and now - self._last_activity <= self.idle_after
+        self.woke = self.idle and active
+        if self.woke:
+            self.wakeups += 1
+        self.idle = not active
+        process = active or now - self._last_processed >= self.idle_interval
+
+        self.frames += 1
+        if process:
+            self.processed += 1
+            self._last_processed = now
+        self.duty_cycle += 0.02 * (float(process) - self.duty_cycle)
+        return process
+
+    def report_hands(self, count, now):
+        """Tangan yang terlihat (walaupun diam) membuat pipeline tetap aktif."""
+        if count:
+            self._last_activity = now
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "processed": self.processed,
+            "overall_duty_cycle": round(self.processed / self.frames, 4) if self.frames else None,
+            "wakeups": self.wakeups,
+        }
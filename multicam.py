@@ -0,0 +1,275 @@
+"""
+Deteksi gestur dari beberapa kamera sekaligus. Setiap kamera punya satu
+proses worker dengan instance MediaPipe `Hands` sendiri, sehingga throughput
+naik sesuai jumlah core. Frame dikirim lewat shared memory (double buffer),
+bukan di-pickle; hanya metadata kecil dan hasil landmark yang lewat antrian.
+
+Contoh:
+    python multicam.py --cameras 0 1 2 --port /dev/ttyACM0
+"""
+import argparse
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from arbiter import CommandArbiter
+from metrics import Metrics
+
+NUM_SLOTS = 2 # Double buffer: kamera menulis satu slot selagi worker membaca slot lainnya
+
+
+class SharedFrameBuffer:
+    """
+    Double buffer frame BGR berukuran tetap di shared memory. Setiap slot
+    dilindungi lock; metadata (frame_id, waktu capture) disimpan per slot
+    di array bersama supaya selalu konsisten dengan isi slot.
+    """
+
+    def __init__(self, shape, ctx, name=None):
+        self.shape = tuple(shape)
+        nbytes = int(np.prod(self.shape)) * NUM_SLOTS
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=nbytes)
+        self.locks = [ctx.Lock() for _ in range(NUM_SLOTS)]
+        self.latest_slot = ctx.Value('i', -1, lock=False)
+        self.frame_ids = ctx.Array('q', NUM_SLOTS, lock=False)
+        self.timestamps = ctx.Array('d', NUM_SLOTS, lock=False)
+        self.ready = ctx.Event()
+
+    def __getstate__(self):
+        # Objek SharedMemory tidak ikut di-pickle; proses worker membuka ulang lewat nama
+        state = self.__dict__.copy()
+        state["shm"] = self.shm.name
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = shared_memory.SharedMemory(name=state["shm"])
+
+    def frames(self):
+        return np.ndarray((NUM_SLOTS, *self.shape), dtype=np.uint8, buffer=self.shm.buf)
+
+    def write(self, image, frame_id, captured_at):
+        """Menyalin frame ke slot yang bukan slot terbaru, lalu menandainya sebagai terbaru."""
+        slot = (self.latest_slot.value + 1) % NUM_SLOTS
+        with self.locks[slot]:
+            np.copyto(self.frames()[slot], image)
+            self.frame_ids[slot] = frame_id
+            self.timestamps[slot] = captured_at
+        self.latest_slot.value = slot
+        self.ready.set()
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def camera_worker(camera_id, buffer, results, stop_event, hands_kwargs):
+    """
+    Proses worker untuk satu kamera: menunggu frame terbaru, memproses dengan
+    instance `Hands` miliknya sendiri, lalu mengirim landmark dan gestur.
+    """
+    import mediapipe as mp_solutions
+    from gestures import classify_gestures
+    from landmarks import landmarks_to_array, handedness_to_is_left, mirror_landmarks
+    from tracking import HandTracker
+
+    hands = mp_solutions.solutions.hands.Hands(**hands_kwargs)
+    frames = buffer.frames()
+    image_rgb = np.empty(buffer.shape, dtype=np.uint8) # Dipakai ulang sebagai dst= tiap frame
+    hand_tracker = HandTracker()
+    last_frame_id = -1
+    try:
+        while not stop_event.is_set():
+            if not buffer.ready.wait(0.1):
+                continue
+            buffer.ready.clear()
+            slot = buffer.latest_slot.value
+            # Lock hanya ditahan selama konversi ke buffer milik worker; frame tidak
+            # di-flip, mirror dilakukan di ruang landmark setelah inferensi
+            with buffer.locks[slot]:
+                frame_id = buffer.frame_ids[slot]
+                captured_at = buffer.timestamps[slot]
+                if frame_id == last_frame_id:
+                    continue
+                cv2.cvtColor(frames[slot], cv2.COLOR_BGR2RGB, dst=image_rgb)
+            last_frame_id = frame_id
+
+            start = time.perf_counter()
+            output = hands.process(image_rgb)
+            coords = mirror_landmarks(landmarks_to_array(output.multi_hand_landmarks))
+            is_left = handedness_to_is_left(output.multi_handedness, len(coords), mirrored=False)
+            commands = classify_gestures(coords, is_left)
+            labels = hand_tracker.update(coords, is_left, captured_at)
+            results.put((camera_id, frame_id, captured_at, coords, labels, commands,
+                         time.perf_counter() - start))
+    finally:
+        hands.close()
+        del frames
+        buffer.close()
+
+
+class CameraFeeder(threading.Thread):
+    """Thread di proses utama yang membaca satu kamera dan menulis ke shared memory."""
+
+    def __init__(self, cap, buffer, stop_event):
+        super().__init__(name=f"feeder-{id(buffer)}", daemon=True)
+        self.cap = cap
+        self.buffer = buffer
+        self.stop_event = stop_event
+        self.frames_read = 0
+
+    def run(self):
+        height, width = self.buffer.shape[:2]
+        while not self.stop_event.is_set():
+            success, image = self.cap.read()
+            if not success:
+                print("Gagal membaca frame dari kamera.")
+                break
+            if image.shape[:2] != (height, width):
+                image = cv2.resize(image, (width, height))
+            self.frames_read += 1
+            self.buffer.write(image, self.frames_read, time.perf_counter())
+
+
+class MultiCameraDetector:
+    """
+    Menjalankan satu proses worker per kamera dan menyalurkan semua hasil ke
+    satu `CommandArbiter`.
+    """
+
+    def __init__(self, camera_indices, send, width=640, height=480, metrics=None, send_many=None, **hands_kwargs):
+        self.camera_indices = list(camera_indices)
+        self.width = width
+        self.height = height
+        self.metrics = metrics or Metrics()
+        self.arbiter = CommandArbiter(send, send_many=send_many)
+        self.hands_kwargs = {
+            "max_num_hands": 1,
+            "min_detection_confidence": 0.7,
+            "min_tracking_confidence": 0.7,
+            **hands_kwargs,
+        }
+        # 'spawn' supaya proses worker tidak mewarisi thread/handle kamera proses utama
+        self.ctx = mp.get_context("spawn")
+        self.results = self.ctx.Queue(maxsize=64)
+        self.stop_event = self.ctx.Event()
+        self._thread_stop = threading.Event()
+        self.caps, self.buffers, self.feeders, self.workers = [], [], [], []
+
+    def start(self):
+        for camera_id in self.camera_indices:
+            cap = cv2.VideoCapture(camera_id)
+            if not cap.isOpened():
+                print(f"Gagal membuka kamera {camera_id}. Melewati...")
+                continue
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+
+            buffer = SharedFrameBuffer((self.height, self.width, 3), self.ctx)
+            worker = self.ctx.Process(
+                target=camera_worker, name=f"camera-{camera_id}", daemon=True,
+                args=(camera_id, buffer, self.results, self.stop_event, self.hands_kwargs)
+            )
+            worker.start()
+            feeder = CameraFeeder(cap, buffer, self._thread_stop)
+            feeder.start()
+
+            self.caps.append(cap)
+            self.buffers.append(buffer)
+            self.workers.append(worker)
+            self.feeders.append(feeder)
+        return len(self.workers)
+
+    def poll(self, timeout=0.1):
+        """
+        Mengambil hasil dari worker dan meneruskannya ke arbiter. Mengembalikan
+        jumlah hasil yang diproses.
+        """
+        processed = 0
+        try:
+            item = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return 0
+        while item is not None:
+            camera_id, frame_id, captured_at, coords, labels, commands, infer_time = item
+            now = time.perf_counter()
+            self.metrics.observe(f"inference_cam{camera_id}", infer_time)
+            self.metrics.observe("latency", now - captured_at)
+            for command in self.arbiter.submit(camera_id, dict(zip(labels, commands)), now):
+                print(f"Mengirim: '{command}' (kamera {camera_id})")
+            processed += 1
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                item = None
+        return processed
+
+    def stop(self):
+        self._thread_stop.set()
+        self.stop_event.set()
+        for feeder in self.feeders:
+            feeder.join(timeout=2)
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for cap in self.caps:
+            cap.release()
+        for buffer in self.buffers:
+            buffer.close(unlink=True)
+
+
+def main(argv=None):
+    from serial_writer import SerialWriter
+
+    parser = argparse.ArgumentParser(description="Deteksi gestur dari beberapa kamera sekaligus.")
+    parser.add_argument("--cameras", type=int, nargs="+", required=True, help="Indeks kamera")
+    parser.add_argument("--port", help="Port serial Arduino (tanpa ini perintah hanya dicetak)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args(argv)
+
+    writer = None
+    if args.port:
+        writer = SerialWriter(args.port, 9600)
+        writer.start()
+        if not writer.wait_first_attempt(timeout=5):
+            print(f"Gagal terhubung ke Arduino di {args.port}.")
+            writer.close()
+            return
+    send = writer.send if writer else (lambda command: None)
+    send_many = writer.send_many if writer else None
+
+    detector = MultiCameraDetector(args.cameras, send, args.width, args.height, send_many=send_many)
+    if detector.start() == 0:
+        print("Tidak ada kamera yang bisa dibuka. Keluar.")
+        detector.stop()
+        return
+
+    print(f"Memproses {len(detector.workers)} kamera. Tekan Ctrl+C untuk keluar.")
+    last_report = time.perf_counter()
+    try:
+        while True:
+            detector.poll()
+            if time.perf_counter() - last_report >= 10:
+                last_report = time.perf_counter()
+                stages = detector.metrics.snapshot()["stages"]
+                summary = ", ".join(f"{name}: {s['count']} frame, p95 {s['p95_ms']}ms" for name, s in stages.items())
+                print(f"[multicam] {summary}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        detector.stop()
+        if writer:
+            writer.close()
+    print("Program multi-kamera selesai.")
+
+
+if __name__ == "__main__":
+    main()
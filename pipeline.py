@@ -0,0 +1,263 @@
+import cv2
+import numpy as np
+import threading
+import time
+from collections import deque
+
+# Garis kerangka tangan seperti mp_hands.HAND_CONNECTIONS, sebagai polyline per jari + telapak
+HAND_POLYLINES = [
+    [0, 1, 2, 3, 4],
+    [5, 6, 7, 8],
+    [9, 10, 11, 12],
+    [13, 14, 15, 16],
+    [17, 18, 19, 20],
+    [0, 5, 9, 13, 17, 0],
+]
+
+
+class LatestQueue:
+    """
+    Antrian berkapasitas tetap yang membuang item paling lama saat penuh.
+    Dipakai di antara tahap pipeline supaya tahap yang lambat selalu
+    mengambil frame terbaru, bukan frame yang sudah menumpuk.
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.on_drop = on_drop # Callback opsional untuk item yang dibuang, misalnya FramePacket.release
+        self.dropped = 0 # Jumlah item lama yang dibuang karena antrian penuh
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(self._items[0])
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """
+        Mengambil item tertua yang masih tersimpan. Mengembalikan None jika
+        waktu tunggu habis atau antrian sudah ditutup dan kosong.
+        """
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class FrameBufferPool:
+    """
+    Kumpulan buffer frame yang dipakai ulang sebagai `dst=` untuk operasi
+    OpenCV, sehingga tidak ada alokasi array besar per frame. Buffer
+    dialokasikan ulang hanya jika ukuran frame berubah (misalnya resolusi
+    diganti scheduler).
+
+    Ada dua cara pakai:
+    - `get()`: buffer bergiliran (round-robin) untuk hasil sementara yang
+      langsung dipakai dan selesai di thread yang sama (konversi warna, flip
+      untuk display). Buffer bisa ditimpa `slots` panggilan kemudian.
+    - `acquire()`/`release()`: free-list untuk frame yang berpindah antar
+      thread. Buffer milik pemanggil sampai dikembalikan dengan `release()`;
+      jika free-list kosong, buffer baru dialokasikan, jadi frame yang masih
+      dipegang tahap lain tidak pernah ditimpa. Free-list dibatasi `slots`.
+    """
+
+    def __init__(self, slots=1, dtype=np.uint8):
+        self.slots = slots
+        self.dtype = dtype
+        self.shape = None
+        self.allocations = 0
+        self._buffers = []
+        self._next = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def _set_shape(self, shape):
+        self.shape = shape
+        self._buffers = []
+        self._next = 0
+        self._free.clear()
+
+    def get(self, shape):
+        shape = tuple(shape)
+        if shape != self.shape or not self._buffers:
+            self._set_shape(shape)
+            self._buffers = [np.empty(shape, dtype=self.dtype) for _ in range(self.slots)]
+            self.allocations += self.slots
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % self.slots
+        return buffer
+
+    def acquire(self, shape):
+        shape = tuple(shape)
+        with self._lock:
+            if shape != self.shape:
+                self._set_shape(shape)
+            if self._free:
+                return self._free.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype=self.dtype)
+
+    def reshape(self, shape):
+        """Menetapkan ukuran buffer `acquire()` berikutnya; free-list ukuran lama dibuang."""
+        shape = tuple(shape)
+        with self._lock:
+            if shape != self.shape:
+                self._set_shape(shape)
+
+    def release(self, buffer):
+        """Mengembalikan buffer dari `acquire()`; buffer berukuran lama dibuang saja."""
+        with self._lock:
+            if buffer.shape == self.shape and buffer.dtype == self.dtype and len(self._free) < self.slots:
+                self._free.append(buffer)
+
+
+def draw_landmarks(image, coords, color=(0, 255, 0), point_color=(0, 0, 255)):
+    """
+    Menggambar kerangka semua tangan dari array (tangan, 21, 3) ternormalisasi
+    langsung ke `image` (in place), satu panggilan polylines per tangan.
+    """
+    height, width = image.shape[:2]
+    points = np.rint(coords[:, :, :2] * (width, height)).astype(np.int32)
+    for hand in points:
+        cv2.polylines(image, [hand[line] for line in HAND_POLYLINES], False, color, 2, cv2.LINE_AA)
+        for x, y in hand:
+            cv2.circle(image, (int(x), int(y)), 3, point_color, -1, cv2.LINE_AA)
+    return image
+
+
+class FramePacket:
+    """
+    Data satu frame yang mengalir dari tahap capture ke tahap berikutnya.
+    `image` adalah frame kamera apa adanya (belum di-mirror); `landmarks`
+    berisi koordinat (tangan, 21, 3) yang sudah di-mirror.
+    """
+    __slots__ = ("frame_id", "captured_at", "image", "results", "landmarks", "status_text", "command", "pool")
+
+    def __init__(self, frame_id, captured_at, image, pool=None):
+        self.frame_id = frame_id
+        self.captured_at = captured_at
+        self.image = image
+        self.results = None
+        self.landmarks = None
+        self.status_text = None
+        self.command = None
+        self.pool = pool # FrameBufferPool asal `image`, jika buffer-nya dipinjam dari pool
+
+    def release(self):
+        """
+        Mengembalikan buffer `image` ke pool. Dipanggil oleh pemakai terakhir
+        frame (atau oleh LatestQueue saat frame dibuang); setelah itu `image`
+        tidak boleh dipakai lagi.
+        """
+        if self.pool is not None:
+            self.pool.release(self.image)
+            self.pool = None
+
+
+class CaptureWorker(threading.Thread):
+    """
+    Thread yang terus membaca kamera dan hanya menyimpan frame terbaru.
+    Dengan begitu latensi I/O kamera tidak ikut menambah waktu inferensi.
+    """
+
+    def __init__(self, cap, outbox, stop_event, on_read=None, pool=None):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.on_read = on_read # Callback opsional (detik) untuk waktu tiap cap.read()
+        self.pool = pool # FrameBufferPool opsional; frame dibaca ke buffer pinjaman, pemakai terakhir memanggil packet.release()
+        self.frames_read = 0
+        self._pending_resolution = None
+
+    def request_resolution(self, width, height):
+        """
+        Meminta perubahan resolusi kamera. Diterapkan dari thread capture
+        sendiri karena objek VideoCapture tidak aman diakses dari thread lain.
+        """
+        self._pending_resolution = (width, height)
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                if self._pending_resolution is not None:
+                    width, height = self._pending_resolution
+                    self._pending_resolution = None
+                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+                start = time.perf_counter()
+                buffer = None
+                if self.pool is not None and self.pool.shape is not None:
+                    buffer = self.pool.acquire(self.pool.shape)
+                    success, image = self.cap.read(buffer)
+                else:
+                    success, image = self.cap.read()
+                if not success:
+                    if buffer is not None:
+                        self.pool.release(buffer)
+                    print("Gagal membaca frame dari kamera.")
+                    break
+                if self.pool is not None:
+                    if buffer is not None and image is not buffer:
+                        self.pool.release(buffer)
+                    # Frame pertama atau resolusi berubah: buffer berikutnya memakai ukuran baru
+                    self.pool.reshape(image.shape)
+                captured_at = time.perf_counter()
+                if self.on_read is not None:
+                    self.on_read(captured_at - start)
+                self.frames_read += 1
+                self.outbox.put(FramePacket(self.frames_read, captured_at, image, pool=self.pool))
+        finally:
+            # Tutup antrian supaya tahap berikutnya tahu sumber frame sudah berhenti
+            self.outbox.close()
+
+
+class StageWorker(threading.Thread):
+    """
+    Thread generik untuk satu tahap pipeline: ambil item dari `inbox`,
+    jalankan `func`, lalu teruskan hasilnya (jika bukan None) ke `outbox`.
+    """
+
+    def __init__(self, name, func, inbox, outbox, stop_event, poll_interval=0.1):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.error = None # Exception terakhir yang menghentikan tahap ini
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                item = self.inbox.get(timeout=self.poll_interval)
+                if item is None:
+                    if self.inbox.closed:
+                        break
+                    continue
+                result = self.func(item)
+                if result is not None and self.outbox is not None:
+                    self.outbox.put(result)
+        except Exception as e:
+            self.error = e
+            self.stop_event.set()
+        finally:
+            if self.outbox is not None:
+                self.outbox.close()
@@ -0,0 +1,219 @@
+"""
+Rekaman landmark dalam format biner ringkas, untuk memutar ulang apa yang
+dilihat detektor saat men-debug masalah di lapangan.
+
+Satu file = header 16 byte, lalu record berukuran tetap yang hanya ditambahkan
+di akhir file (append-only). Tiap record berisi waktu capture, jumlah tangan,
+handedness, dan landmark (max_hands, 21, 3) float16/float32. Karena ukurannya
+tetap, file bisa di-memory-map dan diakses acak tanpa menyalin data; record
+terakhir yang terpotong (misalnya karena listrik padam) cukup diabaikan.
+
+Contoh membaca ulang:
+    python recording.py rekaman/sesi-0001.hplm
+"""
+import glob
+import os
+import struct
+import threading
+
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+from pipeline import LatestQueue
+
+MAGIC = b"HPLM"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBxI4x") # magic, versi, byte per nilai, max_hands, ukuran record
+EXTENSION = ".hplm"
+
+
+def record_dtype(max_hands=2, value_bytes=2):
+    return np.dtype([
+        ("timestamp", "<f8"),
+        ("hand_count", "u1"),
+        ("is_left", "u1", (max_hands,)),
+        ("landmarks", f"<f{value_bytes}", (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+class LandmarkRecorder(threading.Thread):
+    """
+    Penulis rekaman di thread latar belakang. `record()` di jalur panas hanya
+    mengisi satu record kecil dan memasukkannya ke antrian berkapasitas tetap;
+    jika penulis tertinggal, record tertua dibuang (dihitung di `dropped`)
+    sehingga memori tetap terbatas. File dirotasi setelah `max_bytes`, dan
+    hanya `max_files` file terbaru yang disimpan.
+    """
+
+    def __init__(self, prefix, max_hands=2, dtype="float16", max_bytes=64 * 1024 * 1024,
+                 max_files=10, queue_size=512):
+        super().__init__(name="landmark-recorder", daemon=True)
+        self.prefix = prefix
+        self.max_hands = max_hands
+        self.value_bytes = np.dtype(dtype).itemsize
+        self.dtype = record_dtype(max_hands, self.value_bytes)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.queue = LatestQueue(maxsize=queue_size)
+        self.records_written = 0
+        self._file = None
+        self._index = 0
+        self.path = None
+
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        existing = recording_files(prefix)
+        if existing:
+            self._index = int(existing[-1][len(prefix) + 1:-len(EXTENSION)])
+
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    def record(self, timestamp, coords, is_left=None):
+        """Mencatat satu frame; tidak pernah memblokir."""
+        record = np.zeros((), dtype=self.dtype)
+        count = min(len(coords), self.max_hands)
+        record["timestamp"] = timestamp
+        record["hand_count"] = count
+        if count:
+            record["landmarks"][:count] = coords[:count]
+            if is_left is not None:
+                record["is_left"][:count] = is_left[:count]
+        self.queue.put(record)
+
+    def run(self):
+        while True:
+            record = self.queue.get(timeout=0.5)
+            if record is None:
+                if self.queue.closed:
+                    break
+                continue
+            # Kumpulkan record yang sudah menunggu supaya satu write mencakup banyak frame
+            batch = [record]
+            while len(batch) < 256:
+                record = self.queue.get(timeout=0)
+                if record is None:
+                    break
+                batch.append(record)
+            self._write(np.stack(batch))
+        if self._file:
+            self._file.close()
+
+    def _write(self, records):
+        if self._file is None or self._file.tell() + records.nbytes > self.max_bytes:
+            self._rotate()
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.records_written += len(records)
+
+    def _rotate(self):
+        if self._file:
+            self._file.close()
+        self._index += 1
+        self.path = f"{self.prefix}-{self._index:04d}{EXTENSION}"
+        self._file = open(self.path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.value_bytes, self.max_hands, self.dtype.itemsize))
+        for old in recording_files(self.prefix)[:-self.max_files]:
+            os.remove(old)
+
+    def close(self, timeout=2):
+        """Menulis sisa antrian lalu menutup file."""
+        self.queue.close()
+        if self.is_alive():
+            self.join(timeout)
+
+
+def recording_files(prefix):
+    """File rekaman milik satu prefix, urut dari yang tertua."""
+    return sorted(glob.glob(f"{glob.escape(prefix)}-[0-9][0-9][0-9][0-9]{EXTENSION}"))
+
+
+class LandmarkRecording:
+    """
+    Pembaca satu file rekaman lewat memory map. `records` adalah array
+    terstruktur read-only; indeks dan slice tidak menyalin data.
+    """
+
+    labels = None # Rekaman live tidak punya label ground truth (lihat LandmarkReplaySource)
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, value_bytes, max_hands, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} bukan file rekaman landmark yang didukung.")
+        self.max_hands = max_hands
+        self.dtype = record_dtype(max_hands, value_bytes)
+        if self.dtype.itemsize != record_size:
+            raise ValueError(f"Ukuran record di {path} tidak cocok ({record_size} != {self.dtype.itemsize}).")
+
+        count = (os.path.getsize(path) - HEADER.size) // record_size
+        if count > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    @property
+    def hand_counts(self):
+        return self.records["hand_count"]
+
+    def frame(self, index):
+        """(timestamp, landmarks (tangan, 21, 3), is_left (tangan,)) untuk satu frame."""
+        record = self.records[index]
+        count = record["hand_count"]
+        return float(record["timestamp"]), record["landmarks"][:count], record["is_left"][:count].astype(bool)
+
+    def __iter__(self):
+        # Sama dengan LandmarkReplaySource: (landmark (tangan, 21, 3) float32, is_left (tangan,)) per frame
+        for index in range(len(self)):
+            _, coords, is_left = self.frame(index)
+            yield coords.astype(np.float32), is_left
+
+    def reclassify(self, classify=None):
+        """
+        Mengklasifikasikan ulang semua frame dalam satu panggilan vektor.
+        Bawaannya `classify_gestures`, yaitu aturan yang sama dengan
+        `get_gesture_command`. Mengembalikan list perintah per frame.
+        """
+        if classify is None:
+            from gestures import classify_gestures as classify
+
+        counts = self.hand_counts
+        present = np.arange(self.max_hands)[None, :] < counts[:, None]
+        coords = self.records["landmarks"][present].astype(np.float32)
+        is_left = self.records["is_left"][present].astype(bool)
+        commands = classify(coords, is_left)
+
+        frames = [[] for _ in range(len(self))]
+        for frame_index, command in zip(np.nonzero(present)[0], commands):
+            frames[frame_index].append(command)
+        return frames
+
+
+def main(argv=None):
+    import argparse
+    from collections import Counter
+
+    parser = argparse.ArgumentParser(description="Ringkasan dan klasifikasi ulang rekaman landmark.")
+    parser.add_argument("paths", nargs="+", help="File .hplm")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        recording = LandmarkRecording(path)
+        frames = recording.reclassify()
+        duration = float(recording.timestamps[-1] - recording.timestamps[0]) if len(recording) > 1 else 0.0
+        summary = Counter(commands[0] if commands else "-" for commands in frames)
+        print(f"{path}: {len(recording)} frame, {duration:.1f} detik, gestur {dict(summary)}")
+
+
+if __name__ == "__main__":
+    main()
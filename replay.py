@@ -0,0 +1,102 @@
+import cv2
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+
+
+class VideoReplaySource:
+    """
+    Sumber frame dari file video rekaman. Antarmukanya meniru
+    `cv2.VideoCapture` (read/isOpened/set/release) supaya bisa dipakai di
+    tempat kamera, termasuk oleh `CaptureWorker`. Frame dibaca secepat mungkin
+    tanpa menunggu FPS asli video.
+    """
+
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self._cap = cv2.VideoCapture(path)
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def read(self, image=None):
+        success, image = self._cap.read(image)
+        if not success and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self._cap.read(image)
+        return success, image
+
+    def set(self, prop, value):
+        # Resolusi video rekaman tidak bisa diubah; permintaan dari scheduler diabaikan
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            return False
+        return self._cap.set(prop, value)
+
+    def get(self, prop):
+        return self._cap.get(prop)
+
+    def release(self):
+        self._cap.release()
+
+
+class LandmarkReplaySource:
+    """
+    Sumber landmark dari dump `.npz` sehingga klasifikasi gestur bisa diuji
+    tanpa MediaPipe maupun kamera. Isi file:
+    - `landmarks`: float32 (frame, maks_tangan, 21, 3)
+    - `hand_counts`: int (frame,) jumlah tangan valid per frame
+    - `is_left` (opsional): bool (frame, maks_tangan) handedness per tangan;
+      dump lama tanpa array ini dianggap semua tangan kanan
+    - `labels` (opsional): label ground truth per frame ("" jika tidak ada tangan)
+    - `timestamps` (opsional): waktu tiap frame dalam detik
+    """
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            self.landmarks = data["landmarks"].astype(np.float32, copy=False)
+            self.hand_counts = data["hand_counts"]
+            self.is_left = data["is_left"] if "is_left" in data else np.zeros(self.landmarks.shape[:2], dtype=bool)
+            self.labels = data["labels"].tolist() if "labels" in data else None
+            self.timestamps = data["timestamps"] if "timestamps" in data else None
+
+    def __len__(self):
+        return len(self.hand_counts)
+
+    def __iter__(self):
+        """Satu pasangan (landmark (tangan, 21, 3), is_left (tangan,)) per frame."""
+        for landmarks, is_left, count in zip(self.landmarks, self.is_left, self.hand_counts):
+            yield landmarks[:count], is_left[:count]
+
+
+def save_landmark_dump(path, frames, labels=None, timestamps=None, is_left=None):
+    """
+    Menyimpan daftar array (tangan, 21, 3) per frame ke format yang dibaca
+    `LandmarkReplaySource`. Frame dengan jumlah tangan berbeda diisi nol
+    sampai jumlah tangan maksimum. `is_left` adalah daftar array bool
+    (tangan,) per frame, supaya aturan jempol bisa direproduksi saat replay.
+    """
+    hand_counts = np.array([len(f) for f in frames], dtype=np.int32)
+    max_hands = max(int(hand_counts.max()) if len(frames) else 0, 1)
+    landmarks = np.zeros((len(frames), max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+    left = np.zeros((len(frames), max_hands), dtype=bool)
+    for i, coords in enumerate(frames):
+        landmarks[i, :len(coords)] = coords
+        if is_left is not None:
+            left[i, :len(coords)] = is_left[i]
+
+    arrays = {"landmarks": landmarks, "hand_counts": hand_counts, "is_left": left}
+    if labels is not None:
+        arrays["labels"] = np.array(labels, dtype=str)
+    if timestamps is not None:
+        arrays["timestamps"] = np.asarray(timestamps, dtype=np.float64)
+    np.savez_compressed(path, **arrays)
+
+
+def load_labels(path):
+    """
+    Membaca label ground truth dari file teks, satu label per baris per frame.
+    Baris kosong atau "-" berarti tidak ada gestur di frame tersebut.
+    """
+    with open(path, encoding="utf-8") as f:
+        return ["" if line.strip() == "-" else line.strip() for line in f]
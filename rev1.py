@@ -1,24 +1,44 @@
+import math
+import threading
+import time
+
 import cv2
 import numpy as np
 
-def find_available_cameras():
+from camera_discovery import discover_cameras, camera_label
+
+# Info kamera hasil discovery (nama, backend, resolusi, FPS), dikunci dengan indeks
+camera_info = {}
+
+# Ukuran satu thumbnail di jendela pratinjau (lebar, tinggi)
+THUMBNAIL_SIZE = (320, 240)
+PREVIEW_WINDOW = "Pilih Kamera"
+FEED_WINDOW = "Camera Feed"
+
+def find_available_cameras(refresh=False):
     """
     Mencari dan mengembalikan daftar indeks kamera yang tersedia.
+    Di Linux, /dev/video* dienumerasi langsung dan hanya perangkat baru yang
+    di-probe (paralel, dengan timeout); kemampuan kamera disimpan di cache
+    sehingga startup berikutnya tidak perlu membuka kamera sama sekali.
     """
-    available_cameras = []
-    # Coba hingga 10 indeks kamera (kamu bisa sesuaikan jika perlu)
-    for i in range(10):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            available_cameras.append(i)
-            cap.release()
-    return available_cameras
+    camera_info.clear()
+    for camera in discover_cameras(refresh=refresh):
+        camera_info[camera["index"]] = camera
+    return sorted(camera_info)
 
-def get_camera_name(index):
+def get_camera_name(index, cap=None):
     """
-    Mencoba mendapatkan nama kamera (tidak selalu berhasil untuk semua kamera/driver).
-    Ini lebih merupakan tebakan dan mungkin tidak berfungsi pada semua OS/hardware.
+    Mengembalikan nama kamera dari hasil discovery tanpa membuka ulang kamera.
+    Jika kamera belum dikenal, nama diambil dari `cap` yang sudah terbuka;
+    baru tanpa `cap` kamera dicoba dibuka (tidak selalu berhasil untuk semua
+    kamera/driver).
     """
+    if index in camera_info:
+        return camera_label(camera_info[index])
+    if cap is not None and cap.isOpened():
+        backend_name = cap.getBackendName()
+        return f"Camera {index} (Backend: {backend_name})" if backend_name else f"Camera {index} (Generic)"
     try:
         # CAP_DSHOW adalah backend khusus Windows, bisa coba tanpa ini jika di OS lain
         cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
@@ -38,136 +58,169 @@ def get_camera_name(index):
         if 'cap' in locals() and cap.isOpened():
             cap.release()
 
-def select_camera_with_preview_on_top(camera_indices):
+class CameraReader(threading.Thread):
+    """
+    Satu thread per kamera yang membuka perangkat sekali lalu terus membaca
+    dan hanya menyimpan frame terbaru. Kamera tetap terbuka selama aplikasi
+    berjalan, jadi pratinjau dan penggantian kamera tidak pernah menunggu
+    release/open ulang perangkat (yang bisa makan waktu beberapa detik).
+    """
+
+    def __init__(self, index, stop_event):
+        super().__init__(name=f"camera-{index}", daemon=True)
+        self.index = index
+        self.stop_event = stop_event
+        self.name_label = get_camera_name(index) if index in camera_info else f"Camera {index}"
+        self.opened = threading.Event() # Diset setelah percobaan membuka kamera selesai
+        self.failed = False
+        self.frame_id = 0
+        self._frame = None
+        self._lock = threading.Lock()
+        self._thumbnail = np.zeros((THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0], 3), dtype=np.uint8)
+        self._thumbnail_id = 0
+
+    def run(self):
+        # Kamera dibuka dari thread ini sendiri: semua kamera dibuka paralel dan
+        # objek VideoCapture hanya diakses dari satu thread
+        cap = cv2.VideoCapture(self.index)
+        try:
+            if not cap.isOpened():
+                print(f"Gagal membuka kamera {self.index}. Melewati...")
+                self.failed = True
+                return
+            self.name_label = get_camera_name(self.index, cap)
+            self.opened.set()
+            while not self.stop_event.is_set():
+                success, frame = cap.read()
+                if not success:
+                    print(f"Gagal membaca frame dari {self.name_label}.")
+                    self.failed = True
+                    break
+                with self._lock:
+                    self._frame = frame
+                    self.frame_id += 1
+        finally:
+            self.opened.set()
+            cap.release()
+
+    def latest(self):
+        """Mengembalikan (frame_id, frame) terbaru; frame None jika belum ada."""
+        with self._lock:
+            return self.frame_id, self._frame
+
+    def thumbnail(self):
+        """Thumbnail frame terbaru; hanya diperkecil ulang jika ada frame baru."""
+        frame_id, frame = self.latest()
+        if frame is not None and frame_id != self._thumbnail_id:
+            cv2.resize(frame, THUMBNAIL_SIZE, dst=self._thumbnail, interpolation=cv2.INTER_AREA)
+            self._thumbnail_id = frame_id
+        return self._thumbnail
+
+def start_camera_readers(camera_indices, stop_event):
+    """Menjalankan satu CameraReader per kamera dan menunggu semuanya selesai dibuka."""
+    readers = {idx: CameraReader(idx, stop_event) for idx in camera_indices}
+    for reader in readers.values():
+        reader.start()
+    for reader in readers.values():
+        reader.opened.wait(timeout=10)
+    return {idx: reader for idx, reader in readers.items() if not reader.failed}
+
+def key_to_camera(key, readers):
+    """Tombol angka '0'..'9' -> indeks kamera yang aktif, atau None."""
+    index = key - ord('0')
+    if 0 <= index <= 9 and index in readers and not readers[index].failed:
+        return index
+    return None
+
+def select_camera_with_preview_on_top(readers):
     """
-    Menampilkan pratinjau dari setiap kamera dan memungkinkan pengguna memilihnya
-    dengan pratinjau muncul di bagian atas.
+    Menampilkan pratinjau semua kamera sebagai thumbnail dalam satu jendela
+    dan memungkinkan pengguna memilih kamera langsung dengan tombol angka di
+    jendela itu. Frame dibaca oleh thread CameraReader, jadi loop ini hanya
+    menyusun thumbnail dan tidak pernah menunggu kamera mana pun.
     """
-    if not camera_indices:
+    if not readers:
         print("Tidak ada kamera yang terdeteksi.")
         return None
 
-    selected_camera_index = None
-    active_caps = {} # Menyimpan objek VideoCapture yang aktif untuk pratinjau
+    indices = sorted(readers)
+    columns = math.ceil(math.sqrt(len(indices)))
+    rows = math.ceil(len(indices) / columns)
+    width, height = THUMBNAIL_SIZE
+    canvas = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
 
     print("\nPilih kamera yang ingin digunakan:")
-    print("Tekan angka indeks kamera yang kamu inginkan, lalu Enter.")
-    print("Tekan 'q' (di salah satu jendela pratinjau) untuk keluar.")
+    print("Tekan angka indeks kamera di jendela pratinjau.")
+    print("Tekan 'q' untuk keluar.")
 
-    # Loop untuk menampilkan pratinjau semua kamera
-    # Loop ini akan terus berjalan sampai pengguna memilih kamera atau keluar
+    selected_camera_index = None
     while selected_camera_index is None:
-        for idx in camera_indices:
-            # Buka kamera jika belum terbuka untuk pratinjau
-            if idx not in active_caps:
-                active_caps[idx] = cv2.VideoCapture(idx)
-                if not active_caps[idx].isOpened():
-                    print(f"Gagal membuka kamera {idx}. Melewati...")
-                    # Hapus dari daftar jika gagal dibuka
-                    if idx in active_caps:
-                        active_caps[idx].release()
-                        del active_caps[idx]
-                    continue # Lanjut ke kamera berikutnya
-
-            ret, frame = active_caps[idx].read()
-            if ret:
-                # Tambahkan nama/indeks kamera ke frame pratinjau
-                camera_name = get_camera_name(idx)
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                cv2.putText(frame, f"{camera_name} (Tekan '{idx}')", (10, 30), font, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
-                cv2.imshow(f"Pratinjau Kamera {idx}", frame)
-            else:
-                print(f"Gagal membaca frame dari Kamera {idx}.")
-
-        # Tangani input keyboard. Perhatikan, waitKey bekerja di jendela OpenCV
-        key = cv2.waitKey(1) & 0xFF # Ambil input dari jendela OpenCV
+        for position, idx in enumerate(indices):
+            reader = readers[idx]
+            row, column = divmod(position, columns)
+            tile = canvas[row * height:(row + 1) * height, column * width:(column + 1) * width]
+            tile[:] = reader.thumbnail()
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            cv2.putText(tile, f"[{idx}] {reader.name_label}", (8, 22), font, 0.5, (0, 255, 0), 1, cv2.LINE_AA)
+            if reader.failed:
+                cv2.putText(tile, "Tidak ada sinyal", (8, 46), font, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
+        cv2.imshow(PREVIEW_WINDOW, canvas)
+
+        key = cv2.waitKey(15) & 0xFF
         if key == ord('q'):
             print("Memilih keluar dari pemilihan kamera.")
-            break # Keluar dari loop pemilihan
-
-        # Ambil input dari konsol untuk pilihan kamera
-        # Kita perlu sedikit trik di sini karena cv2.waitKey tidak bagus untuk input angka multiline
-        # Pilihan paling mudah adalah meminta input setelah semua pratinjau ditampilkan
-        # Atau kita bisa terus memproses cv2.waitKey untuk menekan angka
-        
-        # Untuk kesederhanaan, kita akan terus menampilkan pratinjau, dan pilihan ada di konsol setelahnya
-        # Jika kamu ingin pilihan langsung dari `waitKey`, itu akan lebih kompleks
-        # Mari kita coba cara yang lebih mudah untuk input angka dari konsol
-        
-        # Karena kita ingin pratinjau di atas, kita akan biarkan loop ini berjalan
-        # dan meminta input setelah loop pratinjau sedikit berjalan atau secara terpisah
-        
-        # Opsi 1: Minta input setelah beberapa detik pratinjau ditampilkan
-        # (ini kurang interaktif)
-
-        # Opsi 2: Tetap minta input 'q' dari waitKey, dan untuk pilihan angka,
-        # kita biarkan pratinjau berjalan, lalu minta input dari terminal
-        
-        # Untuk demonstrasi, kita akan biarkan pratinjau berjalan, lalu di blok utama kita minta input.
-        # Ini berarti pengguna akan melihat pratinjau, lalu kembali ke terminal untuk mengetik angka.
-        # Jika kamu mau input angka langsung di jendela OpenCV, itu akan jadi PR selanjutnya!
-
-    # Tutup semua jendela pratinjau dan rilis kamera sebelum meminta input di konsol
-    for idx, cap in active_caps.items():
-        cap.release()
-        cv2.destroyWindow(f"Pratinjau Kamera {idx}")
-
-    # Sekarang, minta input dari konsol setelah pratinjau ditampilkan
-    if selected_camera_index is None and camera_indices: # Hanya jika belum dipilih dan ada kamera
-        try:
-            choice = input("Masukkan indeks kamera yang ingin digunakan (atau 'q' untuk keluar): ").strip()
-            if choice.isdigit() and int(choice) in camera_indices:
-                selected_camera_index = int(choice)
-            elif choice.lower() == 'q':
-                print("Memilih keluar.")
-                selected_camera_index = None
-            else:
-                print("Pilihan tidak valid.")
-                selected_camera_index = None # Reset atau tandai sebagai tidak valid
-        except ValueError:
-            print("Input tidak valid.")
-            selected_camera_index = None
-            
+            break
+        selected_camera_index = key_to_camera(key, readers)
+
+    cv2.destroyWindow(PREVIEW_WINDOW)
     return selected_camera_index
 
-def run_camera_feed(camera_index):
+def run_camera_feed(readers, camera_index):
     """
-    Menjalankan feed dari kamera yang dipilih dan memungkinkan penggantian kamera.
+    Menjalankan feed dari kamera yang dipilih. Tombol angka langsung
+    mengganti kamera (hot switch: kamera lain sudah terbuka dan membaca,
+    jadi yang berubah hanya sumber frame yang ditampilkan), 'n' kembali ke
+    pratinjau semua kamera, dan 'q' keluar.
     """
     if camera_index is None:
         print("Tidak ada kamera yang dipilih. Keluar.")
-        return
-
-    cap = cv2.VideoCapture(camera_index)
-    if not cap.isOpened():
-        print(f"Gagal membuka kamera {camera_index}. Keluar.")
-        return
+        return False
 
-    current_camera_name = get_camera_name(camera_index)
-    print(f"\nMenampilkan feed dari: {current_camera_name}")
-    print("Tekan 'n' untuk mengganti kamera, 'q' untuk keluar dari feed.")
+    reader = readers[camera_index]
+    print(f"\nMenampilkan feed dari: {reader.name_label}")
+    print("Tekan angka untuk mengganti kamera, 'n' untuk pratinjau semua kamera, 'q' untuk keluar dari feed.")
 
+    shown_id = 0
+    switch_started = None
     while True:
-        ret, frame = cap.read()
-        if not ret:
-            print(f"Gagal membaca frame dari {current_camera_name}. Mencoba lagi...")
-            break
-
-        # Tampilkan nama kamera di frame
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        cv2.putText(frame, current_camera_name, (10, 30), font, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
-        
-        cv2.imshow("Camera Feed", frame)
+        frame_id, frame = reader.latest()
+        if reader.failed:
+            print(f"Gagal membaca frame dari {reader.name_label}.")
+            cv2.destroyWindow(FEED_WINDOW)
+            return True # Kembali ke pratinjau supaya kamera lain bisa dipilih
+        if frame is not None and frame_id != shown_id:
+            shown_id = frame_id
+            # Tampilkan nama kamera di salinan frame; frame asli milik thread pembaca
+            frame = frame.copy()
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            cv2.putText(frame, reader.name_label, (10, 30), font, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
+            cv2.imshow(FEED_WINDOW, frame)
+            if switch_started is not None:
+                print(f"Ganti ke {reader.name_label} dalam {(time.perf_counter() - switch_started) * 1000:.1f} ms")
+                switch_started = None
 
         key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
         elif key == ord('n'):
-            cap.release() # Lepaskan kamera saat ini
-            cv2.destroyWindow("Camera Feed") # Tutup jendela feed saat ini
+            cv2.destroyWindow(FEED_WINDOW) # Kamera tetap terbuka, hanya jendelanya yang ditutup
             return True # Beri sinyal untuk memilih kamera baru
+        new_index = key_to_camera(key, readers)
+        if new_index is not None and readers[new_index] is not reader:
+            switch_started = time.perf_counter()
+            reader = readers[new_index]
+            shown_id = 0
 
-    cap.release()
     cv2.destroyAllWindows()
     return False # Beri sinyal untuk keluar
 
@@ -175,18 +228,27 @@ if __name__ == "__main__":
     available_cams = find_available_cameras()
     print(f"Kamera yang terdeteksi: {available_cams}")
 
-    while True:
-        chosen_cam_idx = select_camera_with_preview_on_top(available_cams)
-        
-        if chosen_cam_idx is not None:
-            if run_camera_feed(chosen_cam_idx):
-                # Jika run_camera_feed mengembalikan True, berarti user ingin ganti kamera
-                continue
+    stop_event = threading.Event()
+    readers = start_camera_readers(available_cams, stop_event)
+    try:
+        while True:
+            chosen_cam_idx = select_camera_with_preview_on_top(readers)
+
+            if chosen_cam_idx is not None:
+                if run_camera_feed(readers, chosen_cam_idx):
+                    # Jika run_camera_feed mengembalikan True, berarti user ingin ganti kamera
+                    continue
+                else:
+                    # Jika run_camera_feed mengembalikan False, berarti user ingin keluar
+                    break
             else:
-                # Jika run_camera_feed mengembalikan False, berarti user ingin keluar
+                print("Tidak ada kamera yang dipilih atau terjadi kesalahan/pembatalan. Keluar.")
                 break
-        else:
-            print("Tidak ada kamera yang dipilih atau terjadi kesalahan/pembatalan. Keluar.")
-            break
+    finally:
+        # Kamera baru dilepas saat aplikasi selesai
+        stop_event.set()
+        for reader in readers.values():
+            reader.join(timeout=2)
+        cv2.destroyAllWindows()
 
     print("Aplikasi kamera selesai.")
\ No newline at end of file
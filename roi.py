@@ -0,0 +1,178 @@
+import cv2
+import numpy as np
+
+from landmarks import landmarks_to_array
+
+
+class RoiTracker:
+    """
+    Mode pelacakan region-of-interest (ROI). Setelah tangan ditemukan, frame
+    berikutnya hanya memproses potongan di sekitar bounding box landmark
+    terakhir (ditambah margin gerak) yang sudah diperkecil. Deteksi frame
+    penuh hanya dijalankan setiap `keyframe_interval` frame, saat tangan
+    hilang, atau saat skor handedness turun di bawah `min_handedness_score`
+    (tanda potongan terlalu sempit atau tangan terpotong).
+
+    Potongan diproses oleh instance `Hands` terpisah dengan
+    `static_image_mode=True`. State tracking instance video-mode milik
+    pemanggil berada di koordinat frame penuh, jadi potongan tidak boleh
+    melewatinya; jika tidak, setiap pergantian frame penuh/potongan merusak
+    state itu.
+
+    Trade-off: mode gambar statis menjalankan deteksi telapak di setiap
+    potongan, sedangkan `hands.process` mode video biasa hanya melacak di
+    antara deteksi. Karena itu ROI tidak otomatis lebih murah dan nonaktif
+    secara bawaan; ukur dengan `benchmark.py --roi` sebelum mengaktifkannya.
+    """
+
+    def __init__(self, keyframe_interval=15, margin=0.3, roi_size=256, min_handedness_score=0.8,
+                 max_num_hands=1, min_detection_confidence=0.5):
+        self.keyframe_interval = keyframe_interval
+        self.margin = margin             # Margin relatif terhadap ukuran bounding box
+        self.roi_size = roi_size         # Sisi terpanjang potongan setelah diperkecil (piksel)
+        self.min_handedness_score = min_handedness_score
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        self._crop_hands = None          # Instance Hands statis untuk potongan, dibuat saat pertama dipakai
+
+        self._bbox = None                # (x0, y0, x1, y1) ternormalisasi dari frame sebelumnya
+        self._velocity = np.zeros(2, dtype=np.float32)
+        self._frames_since_keyframe = 0
+        self._force_full_frame = True
+
+        self.counters = {
+            "frames": 0,
+            "full_frame": 0,
+            "roi": 0,
+            "fallback_keyframe": 0,      # Deteksi penuh terjadwal
+            "fallback_lost": 0,          # Tangan tidak ditemukan di dalam ROI
+            "fallback_low_handedness": 0, # Skor handedness di potongan terlalu rendah
+        }
+
+    def reset(self):
+        self._bbox = None
+        self._velocity[:] = 0
+        self._frames_since_keyframe = 0
+        self._force_full_frame = True
+
+    def process(self, hands, image_rgb):
+        """
+        Menjalankan `hands.process` pada frame penuh atau potongan ROI.
+        Landmark hasil potongan dipetakan kembali ke koordinat frame penuh,
+        jadi pemanggil tidak perlu tahu mode mana yang dipakai.
+        """
+        self.counters["frames"] += 1
+        self._frames_since_keyframe += 1
+
+        if self._bbox is not None and not self._force_full_frame:
+            if self._frames_since_keyframe >= self.keyframe_interval:
+                self.counters["fallback_keyframe"] += 1
+            else:
+                results = self._process_roi(hands, image_rgb)
+                if results is not None:
+                    return results
+
+        return self._process_full_frame(hands, image_rgb)
+
+    def _process_full_frame(self, hands, image_rgb):
+        self.counters["full_frame"] += 1
+        self._frames_since_keyframe = 0
+        results = hands.process(image_rgb)
+        self._update(results)
+        return results
+
+    def _process_roi(self, hands, image_rgb):
+        height, width = image_rgb.shape[:2]
+        x0, y0, x1, y1 = self._crop_box(width, height)
+        crop = image_rgb[y0:y1, x0:x1]
+
+        scale = self.roi_size / max(crop.shape[:2])
+        if scale < 1.0:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        results = self._get_crop_hands().process(np.ascontiguousarray(crop))
+        if not results.multi_hand_landmarks:
+            self.counters["fallback_lost"] += 1
+            return None
+        if self._min_handedness_score(results) < self.min_handedness_score:
+            self.counters["fallback_low_handedness"] += 1
+            return None
+
+        # Petakan koordinat ternormalisasi potongan ke koordinat frame penuh
+        crop_w, crop_h = x1 - x0, y1 - y0
+        for hand_landmarks in results.multi_hand_landmarks:
+            for p in hand_landmarks.landmark:
+                p.x = (x0 + p.x * crop_w) / width
+                p.y = (y0 + p.y * crop_h) / height
+                p.z = p.z * crop_w / width
+
+        self.counters["roi"] += 1
+        self._update(results)
+        return results
+
+    def _get_crop_hands(self):
+        if self._crop_hands is None:
+            import mediapipe as mp
+            self._crop_hands = mp.solutions.hands.Hands(
+                static_image_mode=True,
+                max_num_hands=self.max_num_hands,
+                min_detection_confidence=self.min_detection_confidence
+            )
+        return self._crop_hands
+
+    def close(self):
+        if self._crop_hands is not None:
+            self._crop_hands.close()
+            self._crop_hands = None
+
+    def _crop_box(self, width, height):
+        """
+        Kotak potongan dalam piksel: bounding box terakhir yang digeser sesuai
+        kecepatan, diperlebar dengan margin, dan dibuat persegi.
+        """
+        x0, y0, x1, y1 = self._bbox
+        cx = (x0 + x1) / 2 + self._velocity[0]
+        cy = (y0 + y1) / 2 + self._velocity[1]
+        motion = float(np.abs(self._velocity).max())
+        half = max((x1 - x0) * width, (y1 - y0) * height) * (0.5 + self.margin) + motion * max(width, height)
+
+        left = int(max(0, cx * width - half))
+        top = int(max(0, cy * height - half))
+        right = int(min(width, cx * width + half))
+        bottom = int(min(height, cy * height + half))
+        return left, top, max(right, left + 1), max(bottom, top + 1)
+
+    def _update(self, results):
+        if not results.multi_hand_landmarks:
+            self.reset()
+            return
+
+        coords = landmarks_to_array(results.multi_hand_landmarks)
+        mins = coords[:, :, :2].min(axis=(0, 1))
+        maxs = coords[:, :, :2].max(axis=(0, 1))
+        bbox = (float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1]))
+
+        if self._bbox is not None:
+            prev_center = np.array([(self._bbox[0] + self._bbox[2]) / 2, (self._bbox[1] + self._bbox[3]) / 2])
+            center = np.array([(bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2])
+            self._velocity[:] = center - prev_center
+
+        self._bbox = bbox
+        self._force_full_frame = False
+
+    @staticmethod
+    def _min_handedness_score(results):
+        """Skor klasifikasi kiri/kanan terendah; bukan skor tracking, hanya indikator kualitas potongan."""
+        if not results.multi_handedness:
+            return 1.0
+        return min(h.classification[0].score for h in results.multi_handedness)
+
+    def stats(self):
+        """
+        Ringkasan penghitung beserta rasio fallback ke deteksi frame penuh.
+        """
+        stats = dict(self.counters)
+        frames = max(stats["frames"], 1)
+        stats["roi_ratio"] = stats["roi"] / frames
+        stats["fallback_ratio"] = (stats["fallback_lost"] + stats["fallback_low_handedness"]) / frames
+        return stats
@@ -0,0 +1,121 @@
+import time
+
+
+class AdaptiveScheduler:
+    """
+    Penjadwal adaptif yang menjaga latensi end-to-end (frame ditangkap sampai
+    perintah diputuskan) di bawah anggaran `target_latency`. Waktu tiap tahap
+    diukur dengan rata-rata bergerak eksponensial (EMA), lalu tiga kenop
+    diatur satu langkah setiap kali:
+    1. faktor perkecil gambar sebelum inferensi (paling murah diubah),
+    2. resolusi capture kamera (CAP_PROP_FRAME_WIDTH/HEIGHT),
+    3. rasio lompat frame (hanya 1 dari setiap `skip + 1` frame yang diproses).
+    Saat beban turun, kenop dikembalikan dengan urutan terbalik.
+
+    Tangga resolusi dimulai dari `initial_resolution` (mode asli kamera) lalu
+    hanya resolusi `RESOLUTIONS` yang lebih kecil, jadi scheduler tidak pernah
+    memaksa kamera ke mode di atas mode aslinya.
+    """
+
+    RESOLUTIONS = [(1280, 720), (960, 540), (640, 480), (480, 360), (320, 240)]
+    SCALES = [1.0, 0.75, 0.5]
+    MAX_SKIP = 3
+
+    def __init__(self, target_latency=0.066, alpha=0.2, cooldown=2.0, min_samples=15,
+                 resolution_setter=None, initial_resolution=None):
+        self.target_latency = target_latency
+        self.alpha = alpha               # Bobot sampel baru pada EMA
+        self.cooldown = cooldown         # Jeda minimal (detik) antar perubahan
+        self.min_samples = min_samples   # Sampel latensi minimal sebelum boleh mengubah kenop
+        self.resolution_setter = resolution_setter # Callback (width, height) untuk mengganti resolusi kamera
+
+        self.stage_times = {}            # EMA waktu per tahap (detik)
+        if initial_resolution:
+            initial_resolution = tuple(initial_resolution)
+            area = initial_resolution[0] * initial_resolution[1]
+            self.resolutions = [initial_resolution] + [r for r in self.RESOLUTIONS if r[0] * r[1] < area]
+        else:
+            self.resolutions = list(self.RESOLUTIONS)
+        self.res_idx = 0
+        self.scale_idx = 0
+        self.skip = 0
+
+        self._samples = 0
+        self._last_change = time.perf_counter()
+        self._frame_counter = 0
+
+    @property
+    def resolution(self):
+        return self.resolutions[self.res_idx]
+
+    @property
+    def scale(self):
+        return self.SCALES[self.scale_idx]
+
+    def observe(self, stage, seconds):
+        """Mencatat durasi satu tahap (detik) ke EMA tahap tersebut."""
+        prev = self.stage_times.get(stage)
+        self.stage_times[stage] = seconds if prev is None else prev + self.alpha * (seconds - prev)
+        if stage == "latency":
+            self._samples += 1
+
+    def should_process(self):
+        """True jika frame saat ini perlu diinferensi menurut rasio lompat frame."""
+        self._frame_counter += 1
+        return self._frame_counter % (self.skip + 1) == 0
+
+    def update(self):
+        """
+        Dipanggil sekali per frame yang diproses. Membandingkan EMA latensi
+        dengan anggaran dan mengubah paling banyak satu kenop.
+        """
+        latency = self.stage_times.get("latency")
+        now = time.perf_counter()
+        if latency is None or self._samples < self.min_samples or now - self._last_change < self.cooldown:
+            return False
+
+        if latency > self.target_latency * 1.1:
+            changed = self._degrade()
+        elif latency < self.target_latency * 0.6:
+            changed = self._upgrade()
+        else:
+            changed = None
+
+        if not changed:
+            return False
+
+        self._last_change = now
+        self._samples = 0
+        timings = ", ".join(f"{name}={value * 1000:.1f}ms" for name, value in sorted(self.stage_times.items()))
+        print(f"[scheduler] {changed} (latensi {latency * 1000:.1f}ms, target {self.target_latency * 1000:.0f}ms; {timings})")
+        return True
+
+    def _degrade(self):
+        if self.scale_idx < len(self.SCALES) - 1:
+            self.scale_idx += 1
+            return f"skala inferensi diturunkan ke {self.scale}"
+        if self.res_idx < len(self.resolutions) - 1:
+            self.res_idx += 1
+            self._apply_resolution()
+            return f"resolusi capture diturunkan ke {self.resolution[0]}x{self.resolution[1]}"
+        if self.skip < self.MAX_SKIP:
+            self.skip += 1
+            return f"rasio lompat frame dinaikkan ke 1/{self.skip + 1}"
+        return None
+
+    def _upgrade(self):
+        if self.skip > 0:
+            self.skip -= 1
+            return f"rasio lompat frame diturunkan ke 1/{self.skip + 1}"
+        if self.res_idx > 0:
+            self.res_idx -= 1
+            self._apply_resolution()
+            return f"resolusi capture dinaikkan ke {self.resolution[0]}x{self.resolution[1]}"
+        if self.scale_idx > 0:
+            self.scale_idx -= 1
+            return f"skala inferensi dinaikkan ke {self.scale}"
+        return None
+
+    def _apply_resolution(self):
+        if self.resolution_setter is not None:
+            self.resolution_setter(*self.resolution)
@@ -0,0 +1,142 @@
+"""
+Protokol serial biner opsional. Dibanding perintah teks ("OFF\\n" = 4 byte per
+relay per write), satu frame 6 byte mengubah beberapa relay sekaligus, dan
+baud rate dinaikkan lewat negosiasi saat tersambung.
+
+Format frame (semua 1 byte):
+    SYNC  OPCODE  SEQ  payload...  CRC8
+- SET_RELAYS: payload = mask relay yang diubah, nilai bit relay (1 = ON/buka)
+- HELLO:      payload = kode baud rate yang diminta (indeks BAUD_RATES)
+- ACK:        OPCODE | 0x80, payload = status (0 = OK, selain itu NAK)
+CRC8 (polinom 0x07) dihitung dari OPCODE sampai byte payload terakhir.
+
+Perangkat yang tidak mengerti HELLO tidak membalas ACK; pengirim lalu
+kembali ke perintah teks biasa.
+"""
+SYNC = 0xA5
+OP_SET_RELAYS = 0x01
+OP_HELLO = 0x02
+ACK_FLAG = 0x80
+STATUS_OK = 0
+STATUS_BAD_CHECKSUM = 1
+STATUS_UNKNOWN = 2
+
+BAUD_RATES = [9600, 19200, 57600, 115200, 230400, 460800, 1000000]
+
+# Bit relay di mask dan nilai untuk setiap perintah teks
+RELAY_BITS = {"lamp": 0, "pintu": 1}
+COMMAND_BITS = {
+    "ON": ("lamp", 1),
+    "OFF": ("lamp", 0),
+    'O': ("pintu", 1),
+    'C': ("pintu", 0),
+}
+
+FRAME_SIZES = {OP_SET_RELAYS: 6, OP_HELLO: 5, OP_SET_RELAYS | ACK_FLAG: 5, OP_HELLO | ACK_FLAG: 5}
+
+
+def _crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data):
+    crc = 0
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_frame(opcode, seq, payload):
+    body = bytes([opcode, seq & 0xFF, *payload])
+    return bytes([SYNC]) + body + bytes([crc8(body)])
+
+
+def can_encode(commands):
+    return all(command in COMMAND_BITS for command in commands)
+
+
+def encode_relays(commands, seq):
+    """Satu frame SET_RELAYS untuk semua perintah (perintah terakhir per relay yang berlaku)."""
+    mask = values = 0
+    for command in commands:
+        relay, value = COMMAND_BITS[command]
+        bit = 1 << RELAY_BITS[relay]
+        mask |= bit
+        values = (values | bit) if value else (values & ~bit)
+    return encode_frame(OP_SET_RELAYS, seq, (mask, values))
+
+
+def decode_relays(mask, values):
+    """Kebalikan `encode_relays`: daftar perintah teks dari mask dan nilai."""
+    commands = []
+    for command, (relay, value) in COMMAND_BITS.items():
+        bit = 1 << RELAY_BITS[relay]
+        if mask & bit and bool(values & bit) == bool(value):
+            commands.append(command)
+    return commands
+
+
+def encode_hello(baudrate, seq=0):
+    return encode_frame(OP_HELLO, seq, (BAUD_RATES.index(baudrate),))
+
+
+def encode_ack(opcode, seq, status=STATUS_OK):
+    return encode_frame(opcode | ACK_FLAG, seq, (status,))
+
+
+class FrameDecoder:
+    """
+    Pengurai aliran byte yang bisa berisi frame biner dan baris teks
+    bercampur. `feed()` mengembalikan daftar item: ("frame", opcode, seq,
+    payload), ("bad_frame", opcode, seq), atau ("text", baris). Setelah CRC
+    salah, decoder membuang satu byte lalu mencari SYNC berikutnya.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        items = []
+        while self.buffer:
+            if self.buffer[0] == SYNC:
+                if len(self.buffer) < 2:
+                    break
+                size = FRAME_SIZES.get(self.buffer[1])
+                if size is None:
+                    del self.buffer[0]
+                    continue
+                if len(self.buffer) < size:
+                    break
+                frame = bytes(self.buffer[:size])
+                if crc8(frame[1:-1]) == frame[-1]:
+                    items.append(("frame", frame[1], frame[2], frame[3:-1]))
+                    del self.buffer[:size]
+                else:
+                    items.append(("bad_frame", frame[1], frame[2]))
+                    del self.buffer[0]
+                continue
+
+            newline = self.buffer.find(b"\n")
+            sync = self.buffer.find(bytes([SYNC]))
+            if newline < 0 or (0 <= sync < newline):
+                if sync > 0:
+                    # Sisa teks sebelum frame biner dianggap baris rusak
+                    items.append(("text", bytes(self.buffer[:sync]).decode("utf-8", "replace").strip()))
+                    del self.buffer[:sync]
+                    continue
+                break
+            line = bytes(self.buffer[:newline]).decode("utf-8", "replace").strip()
+            del self.buffer[:newline + 1]
+            if line:
+                items.append(("text", line))
+        return items
@@ -0,0 +1,246 @@
+import threading
+import time
+
+import serial
+
+from metrics import NullMetrics
+from serial_protocol import (
+    OP_HELLO, OP_SET_RELAYS, ACK_FLAG, STATUS_OK, FrameDecoder, can_encode, encode_hello, encode_relays,
+)
+
+# Relay yang dikendalikan setiap perintah. Hanya status target terakhir per relay yang penting.
+COMMAND_RELAYS = {
+    "ON": "lamp",
+    "OFF": "lamp",
+    'O': "pintu",
+    'C': "pintu",
+}
+
+
+class SerialWriter(threading.Thread):
+    """
+    Penulis serial di thread latar belakang. `send()` tidak pernah memblokir:
+    perintah hanya mengganti status target relay-nya, jadi perintah yang
+    tertimpa sebelum sempat dikirim otomatis dibuang. Koneksi yang terputus
+    disambung ulang dengan backoff eksponensial, dan jeda reset Arduino
+    dibayar di thread ini, bukan di thread video.
+
+    Dengan `protocol="binary"`, writer menegosiasikan protokol frame biner
+    (lihat serial_protocol.py) dan `binary_baudrate` setiap kali tersambung.
+    Semua relay yang tertunda dikirim dalam satu frame yang selalu dibalas
+    ACK; frame yang ditolak atau tidak dibalas dikirim ulang. Jika Arduino
+    tidak menjawab negosiasi, writer kembali ke perintah teks.
+    """
+
+    MAX_BINARY_FAILURES = 3 # Setelah ini koneksi dianggap rusak dan disambung ulang
+
+    def __init__(self, port, baudrate=9600, reset_delay=2.0, ack=False, ack_timeout=0.5,
+                 min_backoff=0.5, max_backoff=10.0, metrics=None, relays=None,
+                 protocol="text", binary_baudrate=115200):
+        super().__init__(name="serial-writer", daemon=True)
+        self.port = port
+        self.baudrate = baudrate
+        self.reset_delay = reset_delay   # Waktu tunggu Arduino reset setelah port dibuka
+        self.ack = ack                   # Tunggu satu baris balasan dari Arduino setelah menulis
+        self.ack_timeout = ack_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.metrics = metrics or NullMetrics()
+        self.relays = relays or COMMAND_RELAYS # Perintah -> relay, untuk membuang perintah yang tertimpa
+        self.protocol = protocol         # "text" atau "binary"
+        self.binary_baudrate = binary_baudrate
+        self.binary = False              # True jika protokol biner berhasil dinegosiasikan
+
+        self.connected = False
+        self.last_error = None
+        self._serial = None
+        self._desired = {}               # Status target per relay
+        self._delivered = {}             # Status terakhir yang berhasil dikirim per relay
+        self._pending = {}               # relay -> perintah yang belum dikirim
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._first_attempt = threading.Event()
+        self._seq = 0
+        self._binary_failures = 0
+
+    def send(self, command):
+        """Menjadwalkan perintah tanpa menunggu I/O serial."""
+        self.send_many([command])
+
+    def send_many(self, commands):
+        """
+        Menjadwalkan beberapa perintah sekaligus (misalnya semua relay hasil
+        satu frame). Thread penulis baru dibangunkan setelah semuanya masuk,
+        jadi perintah-perintah ini terkirim dalam satu write.
+        """
+        with self._cond:
+            changed = False
+            for command in commands:
+                relay = self.relays.get(command, command)
+                if relay in self._pending:
+                    self.metrics.increment("commands_collapsed")
+                self._desired[relay] = command
+                if self._delivered.get(relay) == command:
+                    self._pending.pop(relay, None)
+                    continue
+                self._pending[relay] = command
+                changed = True
+            if changed:
+                self._cond.notify()
+
+    def wait_first_attempt(self, timeout=None):
+        """
+        Menunggu percobaan koneksi pertama (tanpa jeda reset). Mengembalikan
+        True jika port berhasil dibuka.
+        """
+        self._first_attempt.wait(timeout)
+        return self._serial is not None
+
+    def close(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        self.join(timeout=2)
+        self._disconnect()
+
+    def run(self):
+        backoff = self.min_backoff
+        while not self._stop_event.is_set():
+            if self._serial is None:
+                if not self._connect():
+                    self._stop_event.wait(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+                    continue
+                backoff = self.min_backoff
+
+            with self._cond:
+                while not self._pending and not self._stop_event.is_set():
+                    self._cond.wait()
+                batch = self._pending
+                self._pending = {}
+            if not batch:
+                continue
+
+            try:
+                self._write(batch)
+            except serial.SerialException as e:
+                print(f"Komunikasi serial terputus: {e}. Mencoba menyambung ulang...")
+                self.last_error = e
+                self._disconnect()
+                with self._cond:
+                    # Kirim ulang status target setelah tersambung lagi
+                    self._delivered.clear()
+                    self._pending = {**self._desired, **self._pending}
+
+    def _connect(self):
+        try:
+            self._serial = serial.Serial(self.port, self.baudrate, timeout=self.ack_timeout)
+        except serial.SerialException as e:
+            self.last_error = e
+            self._first_attempt.set()
+            return False
+
+        self._first_attempt.set()
+        self._stop_event.wait(self.reset_delay)
+        try:
+            self._serial.reset_input_buffer()
+            self.binary = self.protocol == "binary" and self._negotiate()
+        except serial.SerialException as e:
+            self.last_error = e
+            self._disconnect()
+            return False
+        self.connected = True
+        self.metrics.increment("serial_connects")
+        print(f"Koneksi serial ke Arduino berhasil di port {self.port}!")
+
+        with self._cond:
+            # Arduino kembali ke status awal setelah reset, jadi semua target dikirim ulang
+            self._delivered.clear()
+            self._pending = {**self._desired, **self._pending}
+        return True
+
+    def _next_seq(self):
+        self._seq = (self._seq + 1) & 0xFF
+        return self._seq
+
+    def _read_ack(self, opcode, seq):
+        """Menunggu ACK biner untuk `seq`; status, atau None jika waktu habis."""
+        decoder = FrameDecoder()
+        deadline = time.perf_counter() + self.ack_timeout
+        while time.perf_counter() < deadline:
+            data = self._serial.read(self._serial.in_waiting or 1)
+            for item in decoder.feed(data):
+                if item[0] == "frame" and item[1] == opcode | ACK_FLAG and item[2] == seq:
+                    return item[3][0]
+        return None
+
+    def _negotiate(self):
+        """HELLO dengan baud rate yang diminta; Arduino pindah baud setelah mengirim ACK."""
+        seq = self._next_seq()
+        self._serial.write(encode_hello(self.binary_baudrate, seq))
+        if self._read_ack(OP_HELLO, seq) != STATUS_OK:
+            # Sketch lama membaca per baris: akhiri baris berisi byte HELLO supaya perintah berikutnya bersih
+            self._serial.write(b"\n")
+            print("Arduino tidak menjawab negosiasi protokol biner, memakai perintah teks.")
+            return False
+        self._serial.baudrate = self.binary_baudrate
+        self._binary_failures = 0
+        print(f"Protokol biner aktif pada {self.binary_baudrate} baud.")
+        return True
+
+    def _disconnect(self):
+        self.connected = False
+        if self._serial is not None:
+            try:
+                self._serial.close()
+            except serial.SerialException:
+                pass
+            self._serial = None
+
+    def _write(self, batch):
+        if self.binary and can_encode(batch.values()):
+            self._write_binary(batch)
+            return
+
+        # Semua perintah yang tertunda digabung menjadi satu panggilan write
+        payload = "".join(f"{command}\n" for command in batch.values()).encode('utf-8')
+        start = time.perf_counter()
+        with self.metrics.timer("serial_write"):
+            self._serial.write(payload)
+        with self._cond:
+            self._delivered.update(batch)
+        self.metrics.increment("commands_sent", len(batch))
+
+        if self.ack:
+            for _ in batch:
+                line = self._serial.readline()
+                if not line:
+                    self.metrics.increment("serial_ack_timeouts")
+                    break
+                self.metrics.observe("serial_ack", time.perf_counter() - start)
+
+    def _write_binary(self, batch):
+        # Satu frame untuk semua relay yang tertunda, selalu dibalas ACK
+        seq = self._next_seq()
+        start = time.perf_counter()
+        with self.metrics.timer("serial_write"):
+            self._serial.write(encode_relays(batch.values(), seq))
+        status = self._read_ack(OP_SET_RELAYS, seq)
+
+        if status == STATUS_OK:
+            self._binary_failures = 0
+            self.metrics.observe("serial_ack", time.perf_counter() - start)
+            with self._cond:
+                self._delivered.update(batch)
+            self.metrics.increment("commands_sent", len(batch))
+            return
+
+        self.metrics.increment("serial_ack_timeouts" if status is None else "serial_naks")
+        with self._cond:
+            # Kirim ulang status target terbaru, kecuali sudah ada perintah yang lebih baru
+            for relay in batch:
+                self._pending.setdefault(relay, self._desired[relay])
+        self._binary_failures += 1
+        if self._binary_failures >= self.MAX_BINARY_FAILURES:
+            self._binary_failures = 0
+            raise serial.SerialException("ACK biner gagal berulang kali")
@@ -0,0 +1,401 @@
+"""
+Mode layanan headless: deteksi gestur tanpa Tk, tanpa cv2.imshow, dan tanpa
+menggambar overlay. Event gestur dan status relay diekspos lewat API lokal
+berbasis asyncio (JSON per baris di TCP localhost atau Unix socket), sehingga
+proses lain bisa berlangganan tanpa menyentuh kamera.
+
+Contoh:
+    python service.py --config service.example.json
+
+Protokol API (satu objek JSON per baris):
+    -> {"cmd": "subscribe", "topics": ["gesture", "relay", "preview"]}
+    -> {"cmd": "state"}
+    -> {"cmd": "send", "command": "ON"}
+    <- {"type": "gesture", "hand": 3, "command": "ON", "ts": ...}   (hand = ID tangan dari HandTracker)
+    <- {"type": "relay", "relay": "lamp", "command": "ON", "ts": ...}
+    <- {"type": "preview", "jpeg": "<base64>", "width": ..., "height": ..., "ts": ...}
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import signal
+import threading
+import time
+
+from arbiter import CommandArbiter
+from metrics import Metrics, NullMetrics, MetricsServer
+from serial_writer import SerialWriter, COMMAND_RELAYS
+
+DEFAULT_CONFIG = {
+    "camera": 0,                  # Indeks kamera atau path file video
+    "serial_port": None,          # None = tanpa Arduino, event tetap dipublikasikan
+    "baudrate": 9600,
+    "serial_protocol": "text",    # "binary" = protokol frame biner dengan fallback ke teks
+    "binary_baudrate": 115200,
+    "max_num_hands": 1,
+    "min_detection_confidence": 0.5, # Cukup rendah karena jitter diredam oleh "smoothing"
+    "min_tracking_confidence": 0.5,
+    "roi_tracking": False,        # Lihat USE_ROI_TRACKING di gui.py untuk trade-off-nya
+    "relays": dict(COMMAND_RELAYS), # Gestur -> kanal relay
+    "motion_gate": {"enabled": True, "idle_after": 3.0, "idle_interval": 1.0},
+    "smoothing": {"enabled": True, "min_cutoff": 1.0, "beta": 20.0, "max_gap": 0.2},
+    "debounce": {"window": 7, "min_hold": 0.1, "cooldowns": {"ON": 0.5, "OFF": 0.5, "O": 1.0, "C": 1.0}},
+    "api": {"host": "127.0.0.1", "port": 8765, "unix_socket": None},
+    "preview": {"enabled": False, "max_fps": 5, "width": 320, "jpeg_quality": 70},
+    "metrics_port": None,
+}
+
+
+def load_config(path=None):
+    """Membaca file config JSON dan menggabungkannya dengan DEFAULT_CONFIG."""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    if path:
+        with open(path, encoding="utf-8") as f:
+            user_config = json.load(f)
+        for key, value in user_config.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+    return config
+
+
+class EventHub:
+    """
+    Menyalurkan event dari thread deteksi ke semua pelanggan asyncio. Setiap
+    pelanggan punya antrian terbatas; jika pelanggan lambat, event paling lama
+    dibuang sehingga thread deteksi tidak pernah menunggu.
+    """
+
+    def __init__(self, loop, queue_size=64):
+        self.loop = loop
+        self.queue_size = queue_size
+        self.subscribers = {} # asyncio.Queue -> set topik; hanya diubah dari thread loop
+        self._wanted = frozenset() # Gabungan topik semua pelanggan, diganti utuh saat berubah
+
+    def wants(self, topic):
+        """Aman dipanggil dari thread mana pun: hanya membaca snapshot topik."""
+        return topic in self._wanted
+
+    def _update_wanted(self):
+        self._wanted = frozenset().union(*self.subscribers.values())
+
+    def publish(self, event):
+        """Aman dipanggil dari thread mana pun."""
+        self.loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event):
+        for queue, topics in self.subscribers.items():
+            if event["type"] not in topics:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def subscribe(self, topics):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers[queue] = set(topics)
+        self._update_wanted()
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.pop(queue, None)
+        self._update_wanted()
+
+
+class HeadlessDetector(threading.Thread):
+    """
+    Loop deteksi tanpa tampilan: capture di thread terpisah (hanya frame terbaru),
+    lalu mirror, konversi warna, inferensi, klasifikasi, dan arbitrase perintah.
+    """
+
+    def __init__(self, config, hub, send, metrics, send_many=None):
+        super().__init__(name="detector", daemon=True)
+        self.config = config
+        self.hub = hub
+        self.metrics = metrics
+        self.stop_event = threading.Event()
+        self.relays = config["relays"]
+        debounce = config["debounce"]
+        self.arbiter = CommandArbiter(
+            self._on_relay_command, send_many=self._on_relay_commands, relays=self.relays,
+            window=debounce["window"], min_hold=debounce["min_hold"], cooldowns=debounce["cooldowns"]
+        )
+        self._send = send
+        self._send_many = send_many
+        self._last_preview = 0.0
+        self.error = None
+
+    def _on_relay_command(self, command):
+        self._on_relay_commands([command])
+
+    def _on_relay_commands(self, commands):
+        # Semua perintah satu frame diserahkan sekaligus supaya menjadi satu write serial
+        if self._send_many is not None:
+            self._send_many(commands)
+        else:
+            for command in commands:
+                self._send(command)
+        for command in commands:
+            self.hub.publish({"type": "relay", "relay": self.relays.get(command, command),
+                              "command": command, "ts": time.time()})
+
+    def manual_command(self, command):
+        """Perintah relay dari klien API, melewati deteksi gestur (dipanggil dari thread asyncio)."""
+        self.arbiter.override(command)
+
+    def run(self):
+        import cv2
+        import mediapipe as mp
+        from gestures import classify_gestures
+        from landmarks import landmarks_to_array, handedness_to_is_left, mirror_landmarks
+        from pipeline import LatestQueue, CaptureWorker, FrameBufferPool, FramePacket
+        from replay import VideoReplaySource
+        from roi import RoiTracker
+        from smoothing import LandmarkSmoother
+        from tracking import HandTracker
+        from motion import MotionGate
+
+        source = self.config["camera"]
+        cap = VideoReplaySource(source) if isinstance(source, str) else cv2.VideoCapture(source)
+        if not cap.isOpened():
+            self.error = f"Gagal membuka kamera {source}."
+            print(self.error)
+            return
+
+        hands = mp.solutions.hands.Hands(
+            max_num_hands=self.config["max_num_hands"],
+            min_detection_confidence=self.config["min_detection_confidence"],
+            min_tracking_confidence=self.config["min_tracking_confidence"]
+        )
+        roi_tracker = RoiTracker(
+            max_num_hands=self.config["max_num_hands"],
+            min_detection_confidence=self.config["min_detection_confidence"]
+        ) if self.config["roi_tracking"] else None
+        smoothing = dict(self.config["smoothing"])
+        smoother = LandmarkSmoother(**smoothing) if smoothing.pop("enabled", True) else None
+        hand_tracker = HandTracker()
+        gate_config = dict(self.config["motion_gate"])
+        motion_gate = MotionGate(**gate_config) if gate_config.pop("enabled", True) else None
+        frame_queue = LatestQueue(maxsize=1, on_drop=FramePacket.release)
+        rgb_pool = FrameBufferPool()
+        capture_worker = CaptureWorker(cap, frame_queue, self.stop_event, pool=FrameBufferPool(slots=3),
+                                       on_read=lambda seconds: self.metrics.observe("capture", seconds))
+        capture_worker.start()
+
+        try:
+            while not self.stop_event.is_set():
+                packet = frame_queue.get(timeout=0.5)
+                if packet is None:
+                    if frame_queue.closed:
+                        break
+                    continue
+
+                if motion_gate:
+                    with self.metrics.timer("motion_gate"):
+                        active = motion_gate.update(packet.image, packet.captured_at)
+                    self.metrics.set_gauge("duty_cycle", round(motion_gate.duty_cycle, 4))
+                    self.metrics.set_gauge("idle", int(motion_gate.idle))
+                    if not active:
+                        self.metrics.increment("frames_gated")
+                        self._maybe_publish_preview(cv2, packet.image)
+                        packet.release()
+                        continue
+
+                # Tanpa flip piksel: mirror dilakukan di ruang landmark
+                with self.metrics.timer("convert"):
+                    image = packet.image
+                    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_pool.get(image.shape))
+                with self.metrics.timer("inference"):
+                    results = roi_tracker.process(hands, image_rgb) if roi_tracker else hands.process(image_rgb)
+
+                coords = mirror_landmarks(landmarks_to_array(results.multi_hand_landmarks))
+                is_left = handedness_to_is_left(results.multi_handedness, len(coords), mirrored=False)
+                hand_ids = hand_tracker.update(coords, is_left, packet.captured_at)
+                if motion_gate:
+                    motion_gate.report_hands(len(coords), packet.captured_at)
+                if smoother:
+                    with self.metrics.timer("smoothing"):
+                        hand_ids, coords, is_left, _ = smoother.update(hand_ids, coords, is_left, packet.captured_at)
+
+                observations = {}
+                if hand_ids:
+                    with self.metrics.timer("classify"):
+                        commands = classify_gestures(coords, is_left)
+                    observations = dict(zip(hand_ids, commands))
+
+                bank = self.arbiter.banks.get("camera")
+                before = {h: d.stable for h, d in bank.hands.items()} if bank else {}
+                self.arbiter.submit("camera", observations, packet.captured_at)
+                for hand_id, debouncer in self.arbiter.banks["camera"].hands.items():
+                    if debouncer.stable and debouncer.stable != before.get(hand_id):
+                        self.hub.publish({"type": "gesture", "hand": hand_id,
+                                          "command": debouncer.stable, "ts": time.time()})
+
+                now = time.perf_counter()
+                self.metrics.observe("latency", now - packet.captured_at)
+                if motion_gate and motion_gate.woke:
+                    self.metrics.observe("wake_latency", now - packet.captured_at)
+                    self.metrics.increment("motion_wakeups")
+                self._maybe_publish_preview(cv2, image)
+                # Buffer kembali ke pool hanya setelah inferensi dan preview selesai memakainya
+                packet.release()
+        finally:
+            self.stop_event.set()
+            capture_worker.join(timeout=2)
+            cap.release()
+            hands.close()
+            if roi_tracker:
+                roi_tracker.close()
+
+    def _maybe_publish_preview(self, cv2, image):
+        """Preview opsional: hanya di-encode jika ada pelanggan dan batas FPS belum terlampaui."""
+        preview = self.config["preview"]
+        if not preview["enabled"] or not self.hub.wants("preview"):
+            return
+        now = time.perf_counter()
+        if now - self._last_preview < 1.0 / preview["max_fps"]:
+            return
+        self._last_preview = now
+
+        height, width = image.shape[:2]
+        scale = preview["width"] / width
+        # Resize dulu baru di-mirror, supaya flip hanya menyentuh gambar kecil
+        small = cv2.flip(cv2.resize(image, (preview["width"], int(height * scale)), interpolation=cv2.INTER_AREA), 1)
+        ok, jpeg = cv2.imencode(".jpg", small, [cv2.IMWRITE_JPEG_QUALITY, preview["jpeg_quality"]])
+        if ok:
+            self.hub.publish({"type": "preview", "jpeg": base64.b64encode(jpeg.tobytes()).decode("ascii"),
+                              "width": small.shape[1], "height": small.shape[0], "ts": time.time()})
+
+
+class CommandApi:
+    """Server API lokal (JSON per baris) di atas asyncio."""
+
+    def __init__(self, hub, detector, config):
+        self.hub = hub
+        self.detector = detector
+        self.config = config
+
+    async def handle_client(self, reader, writer):
+        queue = None
+        sender = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await self._reply(writer, {"type": "error", "message": "JSON tidak valid"})
+                    continue
+
+                cmd = request.get("cmd")
+                if cmd == "subscribe" and queue is None:
+                    queue = self.hub.subscribe(request.get("topics", ["gesture", "relay"]))
+                    sender = asyncio.ensure_future(self._pump(queue, writer))
+                    await self._reply(writer, {"type": "subscribed", "topics": sorted(self.hub.subscribers[queue])})
+                elif cmd == "state":
+                    await self._reply(writer, {"type": "state", "relays": self.detector.arbiter.state()})
+                elif cmd == "send":
+                    command = request.get("command")
+                    if command in self.detector.relays:
+                        self.detector.manual_command(command)
+                        await self._reply(writer, {"type": "ok"})
+                    else:
+                        await self._reply(writer, {"type": "error", "message": f"Perintah relay tidak dikenal: {command}"})
+                else:
+                    await self._reply(writer, {"type": "error", "message": f"Perintah tidak dikenal: {cmd}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if queue is not None:
+                self.hub.unsubscribe(queue)
+                sender.cancel()
+            writer.close()
+
+    async def _pump(self, queue, writer):
+        while True:
+            event = await queue.get()
+            await self._reply(writer, event)
+
+    @staticmethod
+    async def _reply(writer, message):
+        writer.write((json.dumps(message) + "\n").encode("utf-8"))
+        await writer.drain()
+
+    async def serve(self):
+        api = self.config["api"]
+        if api.get("unix_socket"):
+            if os.path.exists(api["unix_socket"]):
+                os.unlink(api["unix_socket"])
+            server = await asyncio.start_unix_server(self.handle_client, path=api["unix_socket"])
+            print(f"API lokal mendengarkan di {api['unix_socket']}")
+        else:
+            server = await asyncio.start_server(self.handle_client, api["host"], api["port"])
+            print(f"API lokal mendengarkan di {api['host']}:{api['port']}")
+        return server
+
+
+async def run_service(config):
+    loop = asyncio.get_running_loop()
+    metrics = Metrics() if config.get("metrics_port") else NullMetrics()
+    hub = EventHub(loop)
+
+    writer = None
+    if config["serial_port"]:
+        writer = SerialWriter(config["serial_port"], config["baudrate"], metrics=metrics, relays=config["relays"],
+                              protocol=config["serial_protocol"], binary_baudrate=config["binary_baudrate"])
+        writer.start()
+    send = writer.send if writer else (lambda command: None)
+    send_many = writer.send_many if writer else None
+
+    detector = HeadlessDetector(config, hub, send, metrics, send_many=send_many)
+    api = CommandApi(hub, detector, config)
+    server = await api.serve()
+
+    metrics_server = None
+    if config.get("metrics_port"):
+        metrics_server = MetricsServer(metrics, port=config["metrics_port"])
+        metrics_server.start()
+
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass # Windows tidak mendukung add_signal_handler
+
+    detector.start()
+    print("Layanan deteksi gestur berjalan. Kirim SIGTERM atau Ctrl+C untuk berhenti.")
+    while not stop.is_set() and detector.is_alive():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+
+    detector.stop_event.set()
+    await loop.run_in_executor(None, detector.join, 5)
+    server.close()
+    await server.wait_closed()
+    if metrics_server:
+        metrics_server.stop()
+    if writer:
+        writer.close()
+    print("Layanan deteksi gestur selesai.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan deteksi gestur headless dengan API lokal.")
+    parser.add_argument("--config", help="File config JSON (lihat service.example.json)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_service(load_config(args.config)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
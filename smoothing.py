@@ -0,0 +1,88 @@
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+
+
+def _alpha(cutoff, dt):
+    """Koefisien low-pass orde satu untuk frekuensi cutoff (Hz) dan selang waktu dt."""
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class LandmarkSmoother:
+    """
+    Filter One-Euro untuk landmark (21, 3) semua tangan sekaligus. Saat tangan
+    diam, cutoff rendah meredam jitter; saat tangan bergerak cepat, cutoff naik
+    sebanding kecepatan sehingga lag tetap kecil. Karena jitter sudah diredam
+    di sini, ambang kepercayaan MediaPipe bisa diturunkan.
+
+    Tangan yang hilang sebentar (<= `max_gap` detik) diprediksi dengan model
+    kecepatan konstan dari turunan terfilter, jadi status gestur tidak putus
+    dan debouncer tidak melihat frame kosong.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=20.0, d_cutoff=1.0, max_gap=0.2):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.tracks = {} # hand_id -> [posisi, kecepatan, waktu terakhir, is_left]
+        self.predicted_frames = 0
+
+    def reset(self):
+        self.tracks.clear()
+        self.predicted_frames = 0
+
+    def update(self, hand_ids, coords, is_left, now):
+        """
+        Memfilter tangan yang terdeteksi dan menambahkan prediksi untuk tangan
+        yang baru saja hilang. Mengembalikan (hand_ids, coords, is_left,
+        predicted) dengan `predicted` bool per tangan.
+        """
+        hand_ids = list(hand_ids)
+        coords = np.asarray(coords, dtype=np.float32)
+        is_left = np.asarray(is_left, dtype=bool)
+        out = coords.copy()
+
+        known = [i for i, hand_id in enumerate(hand_ids) if hand_id in self.tracks]
+        if known:
+            tracks = [self.tracks[hand_ids[i]] for i in known]
+            prev_x = np.stack([t[0] for t in tracks])
+            prev_dx = np.stack([t[1] for t in tracks])
+            dt = np.maximum(now - np.array([t[2] for t in tracks]), 1e-3)[:, None, None]
+
+            x = coords[known]
+            a_d = _alpha(self.d_cutoff, dt)
+            dx = a_d * ((x - prev_x) / dt) + (1 - a_d) * prev_dx
+            cutoff = self.min_cutoff + self.beta * np.abs(dx)
+            a = _alpha(cutoff, dt)
+            out[known] = a * x + (1 - a) * prev_x
+            for j, i in enumerate(known):
+                self.tracks[hand_ids[i]] = [out[i], dx[j].astype(np.float32), now, is_left[i]]
+
+        for i, hand_id in enumerate(hand_ids):
+            if hand_id not in self.tracks:
+                self.tracks[hand_id] = [out[i], np.zeros((NUM_LANDMARKS, 3), dtype=np.float32), now, is_left[i]]
+
+        # Prediksi untuk tangan yang hilang; state tidak diubah supaya saat tangan
+        # kembali, selang waktu dihitung dari deteksi nyata terakhir
+        predicted_ids, predicted_coords, predicted_left = [], [], []
+        for hand_id, (x, dx, last_seen, left) in list(self.tracks.items()):
+            if hand_id in hand_ids:
+                continue
+            gap = now - last_seen
+            if gap > self.max_gap:
+                del self.tracks[hand_id]
+                continue
+            predicted_ids.append(hand_id)
+            predicted_coords.append(x + dx * gap)
+            predicted_left.append(left)
+
+        predicted = np.zeros(len(hand_ids) + len(predicted_ids), dtype=bool)
+        if predicted_ids:
+            self.predicted_frames += 1
+            predicted[len(hand_ids):] = True
+            hand_ids += predicted_ids
+            out = np.concatenate([out, np.stack(predicted_coords).astype(np.float32)])
+            is_left = np.concatenate([is_left, np.array(predicted_left, dtype=bool)])
+        return hand_ids, out, is_left, predicted
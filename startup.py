@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+
+
+class StartupTimer:
+    """
+    Mencatat waktu setiap tahap cold-start relatif terhadap awal program,
+    supaya waktu startup di kiosk bisa dipantau dari versi ke versi.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        with self._lock:
+            self.marks.append((name, time.perf_counter() - self.origin, threading.current_thread().name))
+
+    def report(self):
+        with self._lock:
+            return [
+                {"stage": name, "elapsed_ms": round(elapsed * 1000.0, 1), "thread": thread}
+                for name, elapsed, thread in self.marks
+            ]
+
+    def print_report(self):
+        print("Laporan waktu startup:")
+        for entry in self.report():
+            print(f"  {entry['elapsed_ms']:>9.1f} ms  {entry['stage']} ({entry['thread']})")
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+class BackgroundLoader(threading.Thread):
+    """
+    Menjalankan fungsi inisialisasi berat (import modul, pembuatan model) di
+    thread latar belakang. `result()` menunggu sampai selesai dan meneruskan
+    exception jika inisialisasi gagal.
+    """
+
+    def __init__(self, func, timer=None, name="warmup"):
+        super().__init__(name=name, daemon=True)
+        self.func = func
+        self.timer = timer
+        self._value = None
+        self._error = None
+
+    def run(self):
+        try:
+            self._value = self.func()
+        except Exception as e:
+            self._error = e
+        if self.timer is not None:
+            self.timer.mark(f"{self.name} selesai")
+
+    def result(self, timeout=None):
+        self.join(timeout)
+        if self._error is not None:
+            raise self._error
+        return self._value
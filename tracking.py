@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+
+# Pergelangan dan pangkal keempat jari: titik paling stabil untuk posisi telapak
+PALM_POINTS = [0, 5, 9, 13, 17]
+
+
+class HandTracker:
+    """
+    Memberi ID tetap untuk setiap tangan antar frame, sehingga debouncer,
+    smoothing, dan arbiter bekerja per operator walaupun urutan tangan dari
+    MediaPipe berubah-ubah. Asosiasi memakai jarak pusat telapak (diprediksi
+    dengan kecepatan terakhir) ditambah penalti jika handedness berbeda;
+    pasangan termurah dipilih lebih dulu (greedy) dan pasangan yang lebih jauh
+    dari `max_distance` dianggap tangan baru.
+    """
+
+    def __init__(self, max_distance=0.2, handedness_penalty=0.3, forget_after=0.5):
+        self.max_distance = max_distance
+        self.handedness_penalty = handedness_penalty
+        self.forget_after = forget_after # Harus lebih lama dari jeda prediksi LandmarkSmoother
+        self.tracks = {} # id -> [pusat (2,), kecepatan (2,), waktu terakhir, is_left]
+        self._ids = itertools.count(1)
+
+    def reset(self):
+        self.tracks.clear()
+
+    def label(self, track_id):
+        """Nama tangan untuk log, misalnya "kanan#3"."""
+        track = self.tracks.get(track_id)
+        side = "?" if track is None else ("kiri" if track[3] else "kanan")
+        return f"{side}#{track_id}"
+
+    def update(self, coords, is_left, now):
+        """Mengembalikan list ID, satu per tangan di `coords` (tangan, 21, 3)."""
+        for track_id in [t for t, track in self.tracks.items() if now - track[2] > self.forget_after]:
+            del self.tracks[track_id]
+
+        count = len(coords)
+        ids = [None] * count
+        if count == 0:
+            return ids
+        centers = coords[:, PALM_POINTS, :2].mean(axis=1)
+        is_left = np.asarray(is_left, dtype=bool)
+
+        if self.tracks:
+            track_ids = list(self.tracks)
+            tracks = [self.tracks[t] for t in track_ids]
+            predicted = np.array([c + v * (now - seen) for c, v, seen, _ in tracks])
+            track_left = np.array([t[3] for t in tracks], dtype=bool)
+
+            cost = np.linalg.norm(predicted[:, None] - centers[None], axis=-1)
+            cost += self.handedness_penalty * (track_left[:, None] != is_left[None])
+            used_tracks = set()
+            for flat in np.argsort(cost, axis=None):
+                t, d = divmod(int(flat), count)
+                if cost[t, d] > self.max_distance:
+                    break
+                if t in used_tracks or ids[d] is not None:
+                    continue
+                used_tracks.add(t)
+                ids[d] = track_ids[t]
+
+        for d in range(count):
+            if ids[d] is None:
+                ids[d] = next(self._ids)
+                self.tracks[ids[d]] = [centers[d], np.zeros(2, dtype=np.float32), now, bool(is_left[d])]
+                continue
+            center, velocity, seen, _ = self.tracks[ids[d]]
+            # Kecepatan dirata-rata supaya jitter deteksi tidak membuat prediksi melompat
+            velocity = 0.5 * velocity + 0.5 * (centers[d] - center) / max(now - seen, 1e-3)
+            self.tracks[ids[d]] = [centers[d], velocity, now, bool(is_left[d])]
+        return ids